@@ -3,10 +3,13 @@ e regista serviços de domínio para atualização de posição/ação e ativaç
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
+import voluptuous as vol
+
 from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.helpers.typing import ConfigType
 
@@ -15,16 +18,28 @@ from .const import (
     SERVICE_SET_KNOWN_POSITION,
     SERVICE_SET_KNOWN_ACTION,
     SERVICE_ACTIVATE_SCRIPT,
+    SERVICE_MOVE_SEQUENCE,
+    SERVICE_PROFILE,
     ATTR_POSITION,
     ATTR_CONFIDENT,
     ATTR_POSITION_TYPE,
     ATTR_ACTION,
+    ATTR_POSITIONS,
+    ATTR_DWELL,
+    ATTR_DURATION,
+    ATTR_MODE,
+    EVENT_PROFILE_FINISHED,
 )
+from .live import async_register_websocket
+from .profiler import MODE_TIMING, MODES, HotPathProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.COVER]
 
+# YAML de topo (opcional): um ou vários blocos {name, defaults, covers: [...]} importados como entries
+CONFIG_SCHEMA = vol.Schema({vol.Optional(DOMAIN): vol.Any(dict, [dict])}, extra=vol.ALLOW_EXTRA)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Setup global (YAML legacy). Regista serviços de domínio."""
@@ -34,6 +49,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     SIGNAL_SET_KNOWN_POSITION = f"{DOMAIN}_set_known_position"
     SIGNAL_SET_KNOWN_ACTION = f"{DOMAIN}_set_known_action"
     SIGNAL_ACTIVATE_SCRIPT = f"{DOMAIN}_activate_script"
+    SIGNAL_MOVE_SEQUENCE = f"{DOMAIN}_move_sequence"
 
     @callback
     def _handle_set_known_position(call: ServiceCall) -> None:
@@ -77,17 +93,97 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         except Exception as exc:
             _LOGGER.debug("Dispatcher não disponível ou erro ao enviar sinal: %s", exc)
 
+    @callback
+    def _handle_move_sequence(call: ServiceCall) -> None:
+        """Executa uma trajetória com vários waypoints como um único movimento planeado."""
+        positions = call.data.get(ATTR_POSITIONS)
+        dwell = call.data.get(ATTR_DWELL, 0)
+        target_entities = call.data.get("entity_id")
+        _LOGGER.debug("[%s] move_sequence: entity_id=%s, positions=%s, dwell=%s", DOMAIN, target_entities, positions, dwell)
+        try:
+            from homeassistant.helpers.dispatcher import async_dispatcher_send
+            async_dispatcher_send(hass, SIGNAL_MOVE_SEQUENCE, target_entities, positions, dwell)
+        except Exception as exc:
+            _LOGGER.debug("Dispatcher não disponível ou erro ao enviar sinal: %s", exc)
+
+    profiler: HotPathProfiler | None = None
+
+    async def _async_profile(duration: float, mode: str) -> None:
+        nonlocal profiler
+        from .cover import TimeBasedSyncCover
+
+        profiler = profiler or HotPathProfiler(hass, TimeBasedSyncCover)
+        try:
+            report = await profiler.async_run(duration, mode)
+        except (RuntimeError, ValueError) as exc:
+            _LOGGER.warning("[%s] profile não iniciado: %s", DOMAIN, exc)
+            return
+        path = hass.config.path(f"{DOMAIN}_profile_{time.strftime('%Y%m%d-%H%M%S')}.txt")
+        header = (
+            f"{DOMAIN} — profile '{mode}' durante {duration:g}s ({time.strftime('%Y-%m-%d %H:%M:%S')})\n"
+            "Tempos aninhados: os handlers do dispatcher incluem as funções que chamam.\n\n"
+        )
+        await hass.async_add_executor_job(_write_report, path, header + report + "\n")
+        _LOGGER.info("[%s] relatório de profiling escrito em %s", DOMAIN, path)
+        hass.bus.async_fire(EVENT_PROFILE_FINISHED, {"path": path, "mode": mode, "duration": duration})
+
+    @callback
+    def _handle_profile(call: ServiceCall) -> None:
+        """Mede os caminhos quentes durante N segundos e escreve um relatório na pasta de configuração."""
+        mode = str(call.data.get(ATTR_MODE, MODE_TIMING)).lower().strip()
+        try:
+            duration = max(1.0, min(3600.0, float(call.data.get(ATTR_DURATION, 30))))
+        except (TypeError, ValueError):
+            duration = 30.0
+        _LOGGER.debug("[%s] profile: mode=%s, duration=%s", DOMAIN, mode, duration)
+        if mode not in MODES:
+            _LOGGER.warning("[%s] profile: modo inválido '%s' (use %s)", DOMAIN, mode, "/".join(MODES))
+            return
+        if profiler is not None and profiler.active:
+            _LOGGER.warning("[%s] profile: já existe uma janela de profiling em curso", DOMAIN)
+            return
+        hass.async_create_task(_async_profile(duration, mode))
+
     hass.services.async_register(DOMAIN, SERVICE_SET_KNOWN_POSITION, _handle_set_known_position)
     hass.services.async_register(DOMAIN, SERVICE_SET_KNOWN_ACTION, _handle_set_known_action)
     hass.services.async_register(DOMAIN, SERVICE_ACTIVATE_SCRIPT, _handle_activate_script)
+    hass.services.async_register(DOMAIN, SERVICE_MOVE_SEQUENCE, _handle_move_sequence)
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _handle_profile)
+    async_register_websocket(hass)
+
+    # Definições em massa no YAML de topo → fluxo de import (uma entry por bloco)
+    blocks = config.get(DOMAIN) or []
+    for block in blocks if isinstance(blocks, list) else [blocks]:
+        hass.async_create_task(
+            hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_IMPORT}, data=dict(block))
+        )
 
     return True
 
 
+def _write_report(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        await _async_release_entry(hass, entry.entry_id)
+    return unload_ok
+
+
+async def _async_release_entry(hass: HomeAssistant, entry_id: str) -> None:
+    """Liberta hass.data da entry e encerra o supervisor (cancela/aguarda tasks pendentes)."""
+    entry_data = hass.data.get(DOMAIN, {}).pop(entry_id, None)
+    if not entry_data:
+        return
+    supervisor = entry_data.get("supervisor")
+    if supervisor is not None:
+        await supervisor.async_shutdown()
+    _LOGGER.debug("Entry %s libertada", entry_id)
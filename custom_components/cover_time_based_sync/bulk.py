@@ -0,0 +1,104 @@
+# custom_components/cover_time_based_sync/bulk.py
+"""Definição em massa: um bloco (YAML ou import) com 'defaults' partilhados e uma lista de 'covers'."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.util import slugify
+
+from .const import (
+    CONF_NAME,
+    CONF_COVERS,
+    CONF_DEFAULTS,
+    CONF_TRAVELLING_TIME_UP,
+    CONF_TRAVELLING_TIME_DOWN,
+    CONF_OPEN_SCRIPT,
+    CONF_CLOSE_SCRIPT,
+    CONF_STOP_SCRIPT,
+    CONF_SINGLE_CONTROL_ENABLED,
+    CONF_SINGLE_CONTROL_PULSE_MS,
+    CONF_SINGLE_CONTROL_CYCLE,
+    CONF_RESYNC_WINDOW,
+)
+from .resync import parse_window
+from .rfcycle import ButtonCycle
+
+# Chaves do bloco que não são opções de cover
+_BLOCK_KEYS = ("platform", CONF_NAME, CONF_COVERS, CONF_DEFAULTS)
+
+
+class CoverEntryView:
+    """Vista 'ConfigEntry-like' (data/options/entry_id) de uma cover definida fora do config flow."""
+
+    def __init__(self, entry_id: str, data: Mapping[str, Any], options: Mapping[str, Any] | None = None) -> None:
+        self.entry_id = entry_id
+        self.data = dict(data)
+        self.options = dict(options or {})
+
+
+def is_bulk(config: Mapping[str, Any]) -> bool:
+    return isinstance(config.get(CONF_COVERS), list)
+
+
+def cover_key(cfg: Mapping[str, Any]) -> str:
+    """Identificador estável de uma cover dentro do bloco (slug do nome)."""
+    return slugify(str(cfg.get(CONF_NAME, "")))
+
+
+def build_cover_configs(config: Mapping[str, Any]) -> tuple[list[dict[str, Any]], list[str]]:
+    """Expande o bloco em configurações completas por cover, validando todas numa passagem.
+
+    Os defaults são as chaves do próprio bloco (exceto nome/lista) mais 'defaults';
+    cada cover sobrepõe-se aos defaults. Devolve (configurações válidas, erros).
+    """
+    defaults = {k: v for k, v in config.items() if k not in _BLOCK_KEYS}
+    defaults.update(config.get(CONF_DEFAULTS) or {})
+
+    configs: list[dict[str, Any]] = []
+    errors: list[str] = []
+    seen: set[str] = set()
+    for idx, item in enumerate(config.get(CONF_COVERS) or []):
+        if not isinstance(item, Mapping):
+            errors.append(f"covers[{idx}]: esperado um mapeamento")
+            continue
+        cfg = {**defaults, **item}
+        label = f"covers[{idx}] ({cfg.get(CONF_NAME, '?')})"
+        problems: list[str] = []
+
+        key = cover_key(cfg)
+        if not key:
+            problems.append("nome em falta")
+        elif key in seen:
+            problems.append("nome duplicado")
+
+        for conf in (CONF_TRAVELLING_TIME_UP, CONF_TRAVELLING_TIME_DOWN):
+            try:
+                if float(cfg.get(conf, 25)) <= 0:
+                    problems.append(f"{conf} tem de ser > 0")
+            except (TypeError, ValueError):
+                problems.append(f"{conf} inválido")
+
+        if cfg.get(CONF_SINGLE_CONTROL_ENABLED):
+            if not any(isinstance(cfg.get(k), str) and cfg.get(k) for k in (CONF_OPEN_SCRIPT, CONF_CLOSE_SCRIPT, CONF_STOP_SCRIPT)):
+                problems.append("Controlo Único requer um script")
+            try:
+                int(cfg.get(CONF_SINGLE_CONTROL_PULSE_MS, 0))
+            except (TypeError, ValueError):
+                problems.append(f"{CONF_SINGLE_CONTROL_PULSE_MS} inválido")
+            try:
+                ButtonCycle.parse(cfg.get(CONF_SINGLE_CONTROL_CYCLE))
+            except ValueError as exc:
+                problems.append(str(exc))
+
+        try:
+            parse_window(cfg.get(CONF_RESYNC_WINDOW))
+        except ValueError as exc:
+            problems.append(str(exc))
+
+        if problems:
+            errors.append(f"{label}: {', '.join(problems)}")
+            continue
+        seen.add(key)
+        configs.append(cfg)
+    return configs, errors
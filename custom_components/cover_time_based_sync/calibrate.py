@@ -0,0 +1,355 @@
+# custom_components/cover_time_based_sync/calibrate.py
+"""
+Ferramenta offline de replay e calibração a partir de traces gravados.
+
+Lê os eventos da integração (motion_started / motion_finished / contact_correction),
+exportados em JSON lines / JSON ou diretamente da base de dados do recorder (SQLite),
+reconstrói os troços com início e fim ancorados (contactos / referências) e ajusta por
+mínimos quadrados, para cada cover, o modelo:
+
+    duração = atraso_arranque + distância/100 × tempo_viagem[direção]
+
+O replay usa o TravelCalculator com relógio virtual (velocidade máxima) para calcular
+o erro de posição com os tempos atuais e com os tempos sugeridos.
+
+Só usa a biblioteca padrão — corre sem Home Assistant:
+
+    python3 custom_components/cover_time_based_sync/calibrate.py trace.jsonl
+    python3 custom_components/cover_time_based_sync/calibrate.py home-assistant_v2.db --json
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import math
+import os
+import sqlite3
+import sys
+from typing import Any, Iterable, Optional
+
+try:
+    from .travelcalculator import TravelCalculator
+except ImportError:  # execução direta como script (sem pacote / sem Home Assistant)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from travelcalculator import TravelCalculator  # type: ignore[no-redef]
+
+DOMAIN = "cover_time_based_sync"
+EVENT_MOTION_STARTED = f"{DOMAIN}_motion_started"
+EVENT_MOTION_FINISHED = f"{DOMAIN}_motion_finished"
+EVENT_CONTACT_CORRECTION = f"{DOMAIN}_contact_correction"
+EVENT_TYPES = (EVENT_MOTION_STARTED, EVENT_MOTION_FINISHED, EVENT_CONTACT_CORRECTION)
+
+MIN_DISTANCE = 5.0  # troços mais curtos (%) são ignorados
+FINISH_GRACE_SEC = 30.0  # contacto aceite até X s após o fim estimado (motor segue até ao batente)
+
+
+@dataclass
+class Segment:
+    """Troço observado: de 'start_pos' (ancorado) a 'end_pos' (ancorado) em 'duration' s.
+
+    'from_start' indica que o troço começa no comando (inclui o atraso de arranque);
+    troços que começam numa referência intermédia já estão em andamento.
+    """
+
+    direction: str  # "up" | "down"
+    start_pos: float
+    end_pos: float
+    duration: float
+    from_start: bool = True
+
+    @property
+    def distance(self) -> float:
+        return abs(self.end_pos - self.start_pos)
+
+
+@dataclass
+class CoverTrace:
+    """Observações e parâmetros atuais (inferidos dos eventos) de uma cover."""
+
+    entity_id: str
+    segments: list[Segment] = field(default_factory=list)
+    current_up: Optional[float] = None
+    current_down: Optional[float] = None
+
+
+# ------------------------------
+# Leitura de traces
+# ------------------------------
+def _parse_time(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def _normalize(raw: dict[str, Any]) -> Optional[tuple[float, str, dict[str, Any]]]:
+    event = raw.get("event", raw)  # aceita também dumps de subscribe_events
+    event_type = event.get("event_type")
+    if event_type not in EVENT_TYPES:
+        return None
+    data = event.get("data") or event.get("event_data") or {}
+    if isinstance(data, str):
+        data = json.loads(data)
+    return _parse_time(event.get("time_fired")), event_type, data
+
+
+def load_trace_file(path: str) -> list[tuple[float, str, dict[str, Any]]]:
+    """Lê JSON lines ou um array JSON de eventos ({event_type, time_fired, data})."""
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        raws: Iterable[dict[str, Any]] = json.loads(stripped)
+    else:
+        raws = (json.loads(line) for line in text.splitlines() if line.strip())
+    events = [ev for ev in (_normalize(r) for r in raws) if ev is not None]
+    events.sort(key=lambda ev: ev[0])
+    return events
+
+
+def load_recorder_db(path: str) -> list[tuple[float, str, dict[str, Any]]]:
+    """Lê os eventos da integração da base de dados SQLite do recorder (esquema novo e antigo)."""
+    placeholders = ",".join("?" for _ in EVENT_TYPES)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        try:
+            rows = conn.execute(
+                "SELECT e.time_fired_ts, t.event_type, d.shared_data FROM events e "
+                "JOIN event_types t ON e.event_type_id = t.event_type_id "
+                "LEFT JOIN event_data d ON e.data_id = d.data_id "
+                f"WHERE t.event_type IN ({placeholders}) ORDER BY e.time_fired_ts",
+                EVENT_TYPES,
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = conn.execute(
+                "SELECT time_fired, event_type, event_data FROM events "
+                f"WHERE event_type IN ({placeholders}) ORDER BY time_fired",
+                EVENT_TYPES,
+            ).fetchall()
+    finally:
+        conn.close()
+    events = []
+    for fired, event_type, data in rows:
+        ev = _normalize({"event_type": event_type, "time_fired": fired, "data": data or "{}"})
+        if ev is not None:
+            events.append(ev)
+    return events
+
+
+def load_events(path: str) -> list[tuple[float, str, dict[str, Any]]]:
+    with open(path, "rb") as fh:
+        is_sqlite = fh.read(16).startswith(b"SQLite format 3")
+    return load_recorder_db(path) if is_sqlite else load_trace_file(path)
+
+
+# ------------------------------
+# Reconstrução de troços ancorados
+# ------------------------------
+def build_traces(events: Iterable[tuple[float, str, dict[str, Any]]]) -> dict[str, CoverTrace]:
+    """Agrupa por cover e extrai troços cujo início e fim são posições confirmadas."""
+    traces: dict[str, CoverTrace] = {}
+    anchor: dict[str, Optional[float]] = {}  # posição confirmada com a cover parada
+    open_seg: dict[str, Optional[tuple[float, float, str, float, bool]]] = {}  # (t0, pos0, direção, expira, arranque)
+
+    for fired, event_type, data in events:
+        entity_id = data.get("entity_id")
+        if not entity_id:
+            continue
+        trace = traces.setdefault(entity_id, CoverTrace(entity_id))
+
+        if event_type == EVENT_MOTION_STARTED:
+            start, target = data.get("from_position"), data.get("to_position")
+            if start is None or target is None or start == target:
+                continue
+            direction = "up" if target > start else "down"
+            duration = data.get("duration")
+            if duration:
+                travel = float(duration) * 100.0 / abs(target - start)
+                if direction == "up":
+                    trace.current_up = travel
+                else:
+                    trace.current_down = travel
+            pos0 = anchor.get(entity_id)
+            open_seg[entity_id] = (fired, pos0, direction, math.inf, True) if pos0 is not None else None
+            anchor[entity_id] = None
+
+        elif event_type == EVENT_CONTACT_CORRECTION:
+            pos1 = data.get("to_position")
+            if pos1 is None:
+                continue
+            seg = open_seg.get(entity_id)
+            if seg is not None and fired <= seg[3]:
+                t0, pos0, direction, _, from_start = seg
+                moved_ok = (pos1 > pos0) if direction == "up" else (pos1 < pos0)
+                if moved_ok and abs(pos1 - pos0) >= MIN_DISTANCE:
+                    trace.segments.append(Segment(direction, float(pos0), float(pos1), fired - t0, from_start))
+                # Referências intermédias: o troço seguinte começa aqui, já em andamento
+                open_seg[entity_id] = (fired, float(pos1), direction, math.inf, False) if pos1 not in (0, 100) else None
+            else:
+                open_seg[entity_id] = None
+            anchor[entity_id] = float(pos1)
+
+        elif event_type == EVENT_MOTION_FINISHED:
+            # Paragem a meio sem confirmação: o próximo arranque não é ancorado.
+            # Em fins de curso o motor continua até ao contacto, que fecha o troço.
+            seg = open_seg.get(entity_id)
+            if seg is None:
+                continue
+            if data.get("target_position") not in (0, 100):
+                open_seg[entity_id] = None
+            else:
+                open_seg[entity_id] = (seg[0], seg[1], seg[2], fired + FINISH_GRACE_SEC, seg[4])
+    return traces
+
+
+# ------------------------------
+# Mínimos quadrados (equações normais, sem dependências)
+# ------------------------------
+def _solve(matrix: list[list[float]], vector: list[float]) -> Optional[list[float]]:
+    """Eliminação de Gauss com pivot parcial; None se singular."""
+    n = len(vector)
+    a = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-9:
+            return None
+        a[col], a[pivot] = a[pivot], a[col]
+        for r in range(n):
+            if r != col:
+                factor = a[r][col] / a[col][col]
+                a[r] = [x - factor * y for x, y in zip(a[r], a[col])]
+    return [a[i][n] / a[i][i] for i in range(n)]
+
+
+def _least_squares(rows: list[list[float]], ys: list[float]) -> Optional[list[float]]:
+    k = len(rows[0])
+    ata = [[sum(r[i] * r[j] for r in rows) for j in range(k)] for i in range(k)]
+    aty = [sum(r[i] * y for r, y in zip(rows, ys)) for i in range(k)]
+    return _solve(ata, aty)
+
+
+def fit(segments: list[Segment]) -> Optional[dict[str, Optional[float]]]:
+    """Ajusta {start_delay, up, down}. Direções sem observações ficam a None.
+
+    Se os dados não permitem separar o atraso (ex.: distâncias todas iguais), ajusta
+    só os tempos de viagem com atraso nulo.
+    """
+    dirs = [d for d in ("up", "down") if any(s.direction == d for s in segments)]
+    if not dirs:
+        return None
+    ys = [s.duration for s in segments]
+    dist = [[s.distance / 100.0 if s.direction == d else 0.0 for d in dirs] for s in segments]
+    sol = None
+    if len(segments) > len(dirs):
+        sol = _least_squares([[1.0 if s.from_start else 0.0] + row for s, row in zip(segments, dist)], ys)
+    if sol is None or sol[0] < 0:
+        sol = _least_squares(dist, ys)
+        if sol is None:
+            return None
+        sol = [0.0] + sol
+    result: dict[str, Optional[float]] = {"start_delay": sol[0], "up": None, "down": None}
+    for d, val in zip(dirs, sol[1:]):
+        result[d] = val
+    return result
+
+
+# ------------------------------
+# Replay com relógio virtual
+# ------------------------------
+class _ReplayCalculator(TravelCalculator):
+    """TravelCalculator com relógio controlado (replay à velocidade máxima)."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, travel_time_down: float, travel_time_up: float) -> None:
+        self.now = 0.0
+        super().__init__(travel_time_down, travel_time_up)
+
+    def current_time(self) -> float:  # type: ignore[override]
+        return self.now
+
+
+def replay_errors(segments: list[Segment], up: float, down: float, start_delay: float = 0.0) -> dict[str, float]:
+    """Erro de posição (%) no instante de cada ancoragem, pelo modelo dado."""
+    calc = _ReplayCalculator(down, up)
+    errors = []
+    for seg in segments:
+        calc.now = 0.0
+        calc.set_position(seg.start_pos)
+        calc.start_travel(100.0 if seg.direction == "up" else 0.0, started_at=start_delay if seg.from_start else 0.0)
+        calc.now = seg.duration
+        errors.append(calc.current_position() - seg.end_pos)
+    if not errors:
+        return {"n": 0}
+    return {
+        "n": len(errors),
+        "mean": round(sum(errors) / len(errors), 2),
+        "rms": round(math.sqrt(sum(e * e for e in errors) / len(errors)), 2),
+        "max_abs": round(max(abs(e) for e in errors), 2),
+    }
+
+
+def calibrate(traces: dict[str, CoverTrace]) -> dict[str, dict[str, Any]]:
+    """Sugestões de opções e estatísticas de erro por cover."""
+    report: dict[str, dict[str, Any]] = {}
+    for entity_id, trace in sorted(traces.items()):
+        entry: dict[str, Any] = {"segments": len(trace.segments)}
+        cur_up, cur_down = trace.current_up, trace.current_down
+        if cur_up and cur_down:
+            entry["error_current"] = replay_errors(trace.segments, cur_up, cur_down)
+        params = fit(trace.segments)
+        if params is not None:
+            up = params["up"] or cur_up
+            down = params["down"] or cur_down
+            suggested: dict[str, Any] = {"actuation_latency_ms": int(round(params["start_delay"] * 1000))}
+            if params["up"]:
+                suggested["travelling_time_up"] = round(params["up"], 1)
+            if params["down"]:
+                suggested["travelling_time_down"] = round(params["down"], 1)
+            entry["suggested"] = suggested
+            if up and down:
+                entry["error_fitted"] = replay_errors(trace.segments, up, down, params["start_delay"])
+        report[entity_id] = entry
+    return report
+
+
+def _print_report(report: dict[str, dict[str, Any]]) -> None:
+    for entity_id, entry in report.items():
+        print(f"{entity_id}  ({entry['segments']} troços ancorados)")
+        if "suggested" in entry:
+            for key, val in entry["suggested"].items():
+                print(f"    {key}: {val}")
+        else:
+            print("    dados insuficientes para ajustar")
+        for label in ("error_current", "error_fitted"):
+            if label in entry and entry[label].get("n"):
+                st = entry[label]
+                print(f"    {label}: rms={st['rms']}% max={st['max_abs']}% média={st['mean']}% (n={st['n']})")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Calibração offline de Cover Time Based Sync a partir de traces.")
+    parser.add_argument("sources", nargs="+", help="Ficheiros JSON/JSON lines ou base de dados SQLite do recorder")
+    parser.add_argument("--entity", action="append", help="Limitar a estas entidades (repetível)")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args(argv)
+
+    events: list[tuple[float, str, dict[str, Any]]] = []
+    for src in args.sources:
+        events.extend(load_events(src))
+    events.sort(key=lambda ev: ev[0])
+    traces = build_traces(events)
+    if args.entity:
+        traces = {k: v for k, v in traces.items() if k in args.entity}
+
+    report = calibrate(traces)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
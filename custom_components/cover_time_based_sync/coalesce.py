@@ -0,0 +1,72 @@
+# custom_components/cover_time_based_sync/coalesce.py
+"""
+Fusão de chamadas idênticas a scripts (modo Standard) entre covers.
+
+- Covers que partilham o script de uma zona (ex.: comando de bus que move várias covers) chamam
+  script.turn_on uma vez cada; numa cena de grupo o mesmo script reinicia dezenas de vezes;
+- A primeira chamada segue de imediato (sem atraso); as idênticas dentro de COALESCE_WINDOW_SEC
+  juntam-se a ela e recebem o mesmo instante de início — cada cover simula o seu movimento a partir daí;
+- Uma chamada (real ou fundida) a outro script da mesma cover (ex.: stop entre dois open) fecha a
+  janela dos restantes scripts dessa cover: o open seguinte volta a ser enviado;
+- Os pulsos RF não passam por aqui: cada pulso avança o ciclo do motor e nunca é fundido.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_COALESCER = f"{DOMAIN}_coalescer"
+COALESCE_WINDOW_SEC = 0.2
+
+
+class ScriptCoalescer:
+    """Uma instância por HA: chamadas em curso/recentes por script."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._recent: dict[str, tuple[float, asyncio.Future]] = {}
+        self.merged = 0
+
+    async def call(self, entity_id: str, *, conflicts: Iterable[str] = ()) -> float:
+        """script.turn_on (ou junta-se a uma chamada idêntica recente). Devolve o instante (monotónico) de início."""
+        now = time.monotonic()
+        # Qualquer chamada (fundida ou real) fecha a janela dos outros scripts desta cover
+        for other in conflicts:
+            if other != entity_id:
+                self._recent.pop(other, None)
+        recent = self._recent.get(entity_id)
+        if recent is not None and now - recent[0] < COALESCE_WINDOW_SEC:
+            self.merged += 1
+            _LOGGER.debug("Chamada a %s fundida com a de há %.0f ms", entity_id, (now - recent[0]) * 1000)
+            # shield: cancelar uma cover não cancela a chamada partilhada
+            await asyncio.shield(recent[1])
+            return recent[0]
+        task = self.hass.async_create_task(
+            self.hass.services.async_call("script", "turn_on", {"entity_id": entity_id}, blocking=False)
+        )
+        self._recent[entity_id] = (now, task)
+        task.add_done_callback(lambda _t: self._expire_later(entity_id, now))
+        await asyncio.shield(task)
+        return now
+
+    def _expire_later(self, key: str, started: float) -> None:
+        """Chamada concluída: a entrada sai no fim da janela (sem uma por script para sempre)."""
+        delay = max(0.0, started + COALESCE_WINDOW_SEC - time.monotonic())
+        asyncio.get_running_loop().call_later(delay, self._expire, key, started)
+
+    def _expire(self, key: str, started: float) -> None:
+        recent = self._recent.get(key)
+        if recent is not None and recent[0] == started:
+            del self._recent[key]
+
+
+def get_coalescer(hass: HomeAssistant) -> ScriptCoalescer:
+    return hass.data.setdefault(DATA_COALESCER, ScriptCoalescer(hass))
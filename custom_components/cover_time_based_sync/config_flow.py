@@ -1,5 +1,6 @@
 """Config flow para Cover Time Based Sync com modo 'Controlo Único' (RF)."""
 from __future__ import annotations
+import logging
 from typing import Any, Dict
 import voluptuous as vol
 from homeassistant.config_entries import (
@@ -21,14 +22,32 @@ from .const import (
     CONF_SEND_STOP_AT_ENDS,
     CONF_ALWAYS_CONFIDENT,
     CONF_SMART_STOP,
+    CONF_ACTUATION_LATENCY_MS,
+    CONF_MEASURE_LATENCY,
+    CONF_REVERSAL_DEAD_TIME_MS,
+    CONF_REVERSAL_GUARD_MS,
     CONF_OPEN_CONTACT_SENSOR,
     CONF_CLOSE_CONTACT_SENSOR,
+    CONF_REFERENCE_SENSORS,
+    CONF_POWER_SENSOR,
+    CONF_POWER_THRESHOLD,
+    CONF_RESYNC_WINDOW,
+    CONF_RESYNC_ERROR_BUDGET,
     CONF_SINGLE_CONTROL_ENABLED,
     CONF_SINGLE_CONTROL_PULSE_MS,
+    CONF_SINGLE_CONTROL_CYCLE,
+    CONF_SINGLE_CONTROL_CHANNEL,
 )
+from .bulk import build_cover_configs, cover_key, is_bulk
+from .resync import parse_window
+from .rfcycle import DEFAULT_CYCLE, ButtonCycle
+
+_LOGGER = logging.getLogger(__name__)
 
 DEFAULT_TRAVEL_TIME = 25
 DEFAULT_PULSE_MS = 2500
+DEFAULT_LATENCY_MS = 0
+DEFAULT_POWER_THRESHOLD = 5.0
 
 
 def _first_script(data: dict[str, Any]) -> str | None:
@@ -39,6 +58,26 @@ def _first_script(data: dict[str, Any]) -> str | None:
     return None
 
 
+def _single_errors(data: dict[str, Any]) -> dict[str, str]:
+    """Validação comum do modo RF: script obrigatório e ciclo do botão válido."""
+    if not _first_script(data):
+        return {"base": "single_control_requires_script"}
+    try:
+        ButtonCycle.parse(data.get(CONF_SINGLE_CONTROL_CYCLE))
+    except ValueError:
+        return {CONF_SINGLE_CONTROL_CYCLE: "invalid_cycle"}
+    return {}
+
+
+def _resync_errors(data: dict[str, Any]) -> dict[str, str]:
+    """Janela calma do resync: "HH:MM-HH:MM" ou vazia."""
+    try:
+        parse_window(data.get(CONF_RESYNC_WINDOW))
+    except ValueError:
+        return {CONF_RESYNC_WINDOW: "invalid_window"}
+    return {}
+
+
 def _entity_optional(
     schema_dict: Dict[Any, Any],
     key: str,
@@ -75,11 +114,11 @@ class CoverTimeBasedSyncFlowHandler(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         if user_input is not None:
-            if not _first_script(user_input):
+            if errors := _single_errors(user_input) or _resync_errors(user_input):
                 return self.async_show_form(
                     step_id="single",
                     data_schema=self._schema_single(defaults=user_input),
-                    errors={"base": "single_control_requires_script"},
+                    errors=errors,
                 )
             data = dict(user_input)
             data[CONF_SINGLE_CONTROL_ENABLED] = True
@@ -94,6 +133,12 @@ class CoverTimeBasedSyncFlowHandler(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         if user_input is not None:
+            if errors := _resync_errors(user_input):
+                return self.async_show_form(
+                    step_id="multi",
+                    data_schema=self._schema_multi(defaults=user_input),
+                    errors=errors,
+                )
             data = dict(user_input)
             data[CONF_SINGLE_CONTROL_ENABLED] = False
             return self.async_create_entry(
@@ -111,10 +156,21 @@ class CoverTimeBasedSyncFlowHandler(ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_SEND_STOP_AT_ENDS, default=d.get(CONF_SEND_STOP_AT_ENDS, False)): bool,
             vol.Optional(CONF_SMART_STOP, default=d.get(CONF_SMART_STOP, False)): bool,
             vol.Optional(CONF_ALWAYS_CONFIDENT, default=d.get(CONF_ALWAYS_CONFIDENT, False)): bool,
+            vol.Optional(CONF_ACTUATION_LATENCY_MS, default=d.get(CONF_ACTUATION_LATENCY_MS, DEFAULT_LATENCY_MS)): int,
+            vol.Optional(CONF_MEASURE_LATENCY, default=d.get(CONF_MEASURE_LATENCY, False)): bool,
+            vol.Optional(CONF_REVERSAL_DEAD_TIME_MS, default=d.get(CONF_REVERSAL_DEAD_TIME_MS, 0)): int,
+            vol.Optional(CONF_REVERSAL_GUARD_MS, default=d.get(CONF_REVERSAL_GUARD_MS, 0)): int,
         }
         _entity_optional(sch, CONF_OPEN_SCRIPT, d.get(CONF_OPEN_SCRIPT), "script")
         _entity_optional(sch, CONF_CLOSE_CONTACT_SENSOR, d.get(CONF_CLOSE_CONTACT_SENSOR), "binary_sensor")
         _entity_optional(sch, CONF_OPEN_CONTACT_SENSOR, d.get(CONF_OPEN_CONTACT_SENSOR), "binary_sensor")
+        sch[vol.Optional(CONF_REFERENCE_SENSORS, default=d.get(CONF_REFERENCE_SENSORS, ""))] = str
+        _entity_optional(sch, CONF_POWER_SENSOR, d.get(CONF_POWER_SENSOR), "sensor")
+        sch[vol.Optional(CONF_POWER_THRESHOLD, default=d.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD))] = vol.Coerce(float)
+        sch[vol.Optional(CONF_RESYNC_WINDOW, default=d.get(CONF_RESYNC_WINDOW, ""))] = str
+        sch[vol.Optional(CONF_RESYNC_ERROR_BUDGET, default=d.get(CONF_RESYNC_ERROR_BUDGET, 0))] = vol.Coerce(float)
+        sch[vol.Optional(CONF_SINGLE_CONTROL_CYCLE, default=d.get(CONF_SINGLE_CONTROL_CYCLE, DEFAULT_CYCLE))] = str
+        sch[vol.Optional(CONF_SINGLE_CONTROL_CHANNEL, default=d.get(CONF_SINGLE_CONTROL_CHANNEL, ""))] = str
         return vol.Schema(sch)
 
     def _schema_multi(self, defaults: dict[str, Any] | None = None) -> vol.Schema:
@@ -126,14 +182,41 @@ class CoverTimeBasedSyncFlowHandler(ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_SEND_STOP_AT_ENDS, default=d.get(CONF_SEND_STOP_AT_ENDS, False)): bool,
             vol.Optional(CONF_SMART_STOP, default=d.get(CONF_SMART_STOP, False)): bool,
             vol.Optional(CONF_ALWAYS_CONFIDENT, default=d.get(CONF_ALWAYS_CONFIDENT, False)): bool,
+            vol.Optional(CONF_ACTUATION_LATENCY_MS, default=d.get(CONF_ACTUATION_LATENCY_MS, DEFAULT_LATENCY_MS)): int,
+            vol.Optional(CONF_MEASURE_LATENCY, default=d.get(CONF_MEASURE_LATENCY, False)): bool,
+            vol.Optional(CONF_REVERSAL_DEAD_TIME_MS, default=d.get(CONF_REVERSAL_DEAD_TIME_MS, 0)): int,
+            vol.Optional(CONF_REVERSAL_GUARD_MS, default=d.get(CONF_REVERSAL_GUARD_MS, 0)): int,
         }
         _entity_optional(sch, CONF_OPEN_SCRIPT, d.get(CONF_OPEN_SCRIPT), "script")
         _entity_optional(sch, CONF_CLOSE_SCRIPT, d.get(CONF_CLOSE_SCRIPT), "script")
         _entity_optional(sch, CONF_STOP_SCRIPT, d.get(CONF_STOP_SCRIPT), "script")
         _entity_optional(sch, CONF_CLOSE_CONTACT_SENSOR, d.get(CONF_CLOSE_CONTACT_SENSOR), "binary_sensor")
         _entity_optional(sch, CONF_OPEN_CONTACT_SENSOR, d.get(CONF_OPEN_CONTACT_SENSOR), "binary_sensor")
+        sch[vol.Optional(CONF_REFERENCE_SENSORS, default=d.get(CONF_REFERENCE_SENSORS, ""))] = str
+        _entity_optional(sch, CONF_POWER_SENSOR, d.get(CONF_POWER_SENSOR), "sensor")
+        sch[vol.Optional(CONF_POWER_THRESHOLD, default=d.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD))] = vol.Coerce(float)
+        sch[vol.Optional(CONF_RESYNC_WINDOW, default=d.get(CONF_RESYNC_WINDOW, ""))] = str
+        sch[vol.Optional(CONF_RESYNC_ERROR_BUDGET, default=d.get(CONF_RESYNC_ERROR_BUDGET, 0))] = vol.Coerce(float)
         return vol.Schema(sch)
 
+    # -------- Import (definição em massa) --------
+    async def async_step_import(self, import_data: dict[str, Any]) -> ConfigFlowResult:
+        """Importa um bloco {defaults, covers: [...]} como uma única entry (todas as covers de uma vez)."""
+        data = dict(import_data)
+        if not is_bulk(data):
+            data = {CONF_NAME: data.get(CONF_NAME, "Cover Time Based Sync"), CONF_COVERS: [data]}
+        configs, errors = build_cover_configs(data)
+        if errors or not configs:
+            for err in errors:
+                _LOGGER.error("Import '%s' inválido: %s", data.get(CONF_NAME), err)
+            return self.async_abort(reason="invalid_import")
+
+        name = str(data.get(CONF_NAME) or "Cover Time Based Sync")
+        await self.async_set_unique_id(f"import_{cover_key({CONF_NAME: name})}")
+        # Re-import do mesmo bloco atualiza a entry existente (e recarrega)
+        self._abort_if_unique_id_configured(updates=data)
+        return self.async_create_entry(title=f"{name} ({len(configs)})", data=data)
+
     # -------- Reconfigure --------
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
@@ -150,15 +233,17 @@ class CoverTimeBasedSyncFlowHandler(ConfigFlow, domain=DOMAIN):
 
         if entry is None:
             return self.async_abort(reason="unknown_entry")
+        if is_bulk(entry.data):
+            return self.async_abort(reason="bulk_entry_yaml_only")
 
         single = bool(entry.data.get(CONF_SINGLE_CONTROL_ENABLED, False))
 
         if user_input:
-            if single and not _first_script(user_input):
+            if errors := (_single_errors(user_input) if single else {}) or _resync_errors(user_input):
                 return self.async_show_form(
                     step_id="reconfigure",
                     data_schema=self._schema_reconfigure(entry, user_input),
-                    errors={"base": "single_control_requires_script"},
+                    errors=errors,
                 )
 
             updater = getattr(self, "async_update_reload_and_abort", None)
@@ -185,18 +270,34 @@ class CoverTimeBasedSyncFlowHandler(ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_SEND_STOP_AT_ENDS, default=d.get(CONF_SEND_STOP_AT_ENDS, False)): bool,
             vol.Optional(CONF_ALWAYS_CONFIDENT, default=d.get(CONF_ALWAYS_CONFIDENT, False)): bool,
             vol.Optional(CONF_SMART_STOP, default=d.get(CONF_SMART_STOP, False)): bool,
+            vol.Optional(CONF_ACTUATION_LATENCY_MS, default=d.get(CONF_ACTUATION_LATENCY_MS, DEFAULT_LATENCY_MS)): int,
+            vol.Optional(CONF_MEASURE_LATENCY, default=d.get(CONF_MEASURE_LATENCY, False)): bool,
+            vol.Optional(CONF_REVERSAL_DEAD_TIME_MS, default=d.get(CONF_REVERSAL_DEAD_TIME_MS, 0)): int,
+            vol.Optional(CONF_REVERSAL_GUARD_MS, default=d.get(CONF_REVERSAL_GUARD_MS, 0)): int,
         }
         if single:
             _entity_optional(sch, CONF_OPEN_SCRIPT, d.get(CONF_OPEN_SCRIPT), "script")
             _entity_optional(sch, CONF_CLOSE_CONTACT_SENSOR, d.get(CONF_CLOSE_CONTACT_SENSOR), "binary_sensor")
             _entity_optional(sch, CONF_OPEN_CONTACT_SENSOR, d.get(CONF_OPEN_CONTACT_SENSOR), "binary_sensor")
+            sch[vol.Optional(CONF_REFERENCE_SENSORS, default=d.get(CONF_REFERENCE_SENSORS, ""))] = str
+            _entity_optional(sch, CONF_POWER_SENSOR, d.get(CONF_POWER_SENSOR), "sensor")
+            sch[vol.Optional(CONF_POWER_THRESHOLD, default=d.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD))] = vol.Coerce(float)
+            sch[vol.Optional(CONF_RESYNC_WINDOW, default=d.get(CONF_RESYNC_WINDOW, ""))] = str
+            sch[vol.Optional(CONF_RESYNC_ERROR_BUDGET, default=d.get(CONF_RESYNC_ERROR_BUDGET, 0))] = vol.Coerce(float)
             sch[vol.Optional(CONF_SINGLE_CONTROL_PULSE_MS, default=d.get(CONF_SINGLE_CONTROL_PULSE_MS, DEFAULT_PULSE_MS))] = int
+            sch[vol.Optional(CONF_SINGLE_CONTROL_CYCLE, default=d.get(CONF_SINGLE_CONTROL_CYCLE, DEFAULT_CYCLE))] = str
+            sch[vol.Optional(CONF_SINGLE_CONTROL_CHANNEL, default=d.get(CONF_SINGLE_CONTROL_CHANNEL, ""))] = str
         else:
             _entity_optional(sch, CONF_OPEN_SCRIPT, d.get(CONF_OPEN_SCRIPT), "script")
             _entity_optional(sch, CONF_CLOSE_SCRIPT, d.get(CONF_CLOSE_SCRIPT), "script")
             _entity_optional(sch, CONF_STOP_SCRIPT, d.get(CONF_STOP_SCRIPT), "script")
             _entity_optional(sch, CONF_CLOSE_CONTACT_SENSOR, d.get(CONF_CLOSE_CONTACT_SENSOR), "binary_sensor")
             _entity_optional(sch, CONF_OPEN_CONTACT_SENSOR, d.get(CONF_OPEN_CONTACT_SENSOR), "binary_sensor")
+            sch[vol.Optional(CONF_REFERENCE_SENSORS, default=d.get(CONF_REFERENCE_SENSORS, ""))] = str
+            _entity_optional(sch, CONF_POWER_SENSOR, d.get(CONF_POWER_SENSOR), "sensor")
+            sch[vol.Optional(CONF_POWER_THRESHOLD, default=d.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD))] = vol.Coerce(float)
+            sch[vol.Optional(CONF_RESYNC_WINDOW, default=d.get(CONF_RESYNC_WINDOW, ""))] = str
+            sch[vol.Optional(CONF_RESYNC_ERROR_BUDGET, default=d.get(CONF_RESYNC_ERROR_BUDGET, 0))] = vol.Coerce(float)
         return vol.Schema(sch)
 
     # -------- Options Flow --------
@@ -213,16 +314,18 @@ class OptionsFlowHandler(OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         entry: ConfigEntry = self.config_entry
+        if is_bulk(entry.data):
+            return self.async_abort(reason="bulk_entry_yaml_only")
         single = bool(entry.data.get(CONF_SINGLE_CONTROL_ENABLED, False))
         data = entry.data
         options = entry.options
 
         if user_input is not None:
-            if single and not _first_script(user_input):
+            if errors := (_single_errors(user_input) if single else {}) or _resync_errors(user_input):
                 return self.async_show_form(
                     step_id="init",
                     data_schema=self._schema_options(single, options=user_input, data=data),
-                    errors={"base": "single_control_requires_script"},
+                    errors=errors,
                 )
             return self.async_create_entry(title="", data=user_input)
 
@@ -245,16 +348,32 @@ class OptionsFlowHandler(OptionsFlow):
             vol.Optional(CONF_SEND_STOP_AT_ENDS, default=o.get(CONF_SEND_STOP_AT_ENDS, d.get(CONF_SEND_STOP_AT_ENDS, False))): bool,
             vol.Optional(CONF_ALWAYS_CONFIDENT, default=o.get(CONF_ALWAYS_CONFIDENT, d.get(CONF_ALWAYS_CONFIDENT, False))): bool,
             vol.Optional(CONF_SMART_STOP, default=o.get(CONF_SMART_STOP, d.get(CONF_SMART_STOP, False))): bool,
+            vol.Optional(CONF_ACTUATION_LATENCY_MS, default=o.get(CONF_ACTUATION_LATENCY_MS, d.get(CONF_ACTUATION_LATENCY_MS, DEFAULT_LATENCY_MS))): int,
+            vol.Optional(CONF_MEASURE_LATENCY, default=o.get(CONF_MEASURE_LATENCY, d.get(CONF_MEASURE_LATENCY, False))): bool,
+            vol.Optional(CONF_REVERSAL_DEAD_TIME_MS, default=o.get(CONF_REVERSAL_DEAD_TIME_MS, d.get(CONF_REVERSAL_DEAD_TIME_MS, 0))): int,
+            vol.Optional(CONF_REVERSAL_GUARD_MS, default=o.get(CONF_REVERSAL_GUARD_MS, d.get(CONF_REVERSAL_GUARD_MS, 0))): int,
         }
         if single:
             _entity_optional(sch, CONF_OPEN_SCRIPT, o.get(CONF_OPEN_SCRIPT, d.get(CONF_OPEN_SCRIPT)), "script")
             _entity_optional(sch, CONF_CLOSE_CONTACT_SENSOR, o.get(CONF_CLOSE_CONTACT_SENSOR, d.get(CONF_CLOSE_CONTACT_SENSOR)), "binary_sensor")
             _entity_optional(sch, CONF_OPEN_CONTACT_SENSOR, o.get(CONF_OPEN_CONTACT_SENSOR, d.get(CONF_OPEN_CONTACT_SENSOR)), "binary_sensor")
+            sch[vol.Optional(CONF_REFERENCE_SENSORS, default=o.get(CONF_REFERENCE_SENSORS, d.get(CONF_REFERENCE_SENSORS, "")))] = str
+            _entity_optional(sch, CONF_POWER_SENSOR, o.get(CONF_POWER_SENSOR, d.get(CONF_POWER_SENSOR)), "sensor")
+            sch[vol.Optional(CONF_POWER_THRESHOLD, default=o.get(CONF_POWER_THRESHOLD, d.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD)))] = vol.Coerce(float)
+            sch[vol.Optional(CONF_RESYNC_WINDOW, default=o.get(CONF_RESYNC_WINDOW, d.get(CONF_RESYNC_WINDOW, "")))] = str
+            sch[vol.Optional(CONF_RESYNC_ERROR_BUDGET, default=o.get(CONF_RESYNC_ERROR_BUDGET, d.get(CONF_RESYNC_ERROR_BUDGET, 0)))] = vol.Coerce(float)
             sch[vol.Optional(CONF_SINGLE_CONTROL_PULSE_MS, default=o.get(CONF_SINGLE_CONTROL_PULSE_MS, d.get(CONF_SINGLE_CONTROL_PULSE_MS, DEFAULT_PULSE_MS)))] = int
+            sch[vol.Optional(CONF_SINGLE_CONTROL_CYCLE, default=o.get(CONF_SINGLE_CONTROL_CYCLE, d.get(CONF_SINGLE_CONTROL_CYCLE, DEFAULT_CYCLE)))] = str
+            sch[vol.Optional(CONF_SINGLE_CONTROL_CHANNEL, default=o.get(CONF_SINGLE_CONTROL_CHANNEL, d.get(CONF_SINGLE_CONTROL_CHANNEL, "")))] = str
         else:
             _entity_optional(sch, CONF_OPEN_SCRIPT, o.get(CONF_OPEN_SCRIPT, d.get(CONF_OPEN_SCRIPT)), "script")
             _entity_optional(sch, CONF_CLOSE_SCRIPT, o.get(CONF_CLOSE_SCRIPT, d.get(CONF_CLOSE_SCRIPT)), "script")
             _entity_optional(sch, CONF_STOP_SCRIPT, o.get(CONF_STOP_SCRIPT, d.get(CONF_STOP_SCRIPT)), "script")
             _entity_optional(sch, CONF_CLOSE_CONTACT_SENSOR, o.get(CONF_CLOSE_CONTACT_SENSOR, d.get(CONF_CLOSE_CONTACT_SENSOR)), "binary_sensor")
             _entity_optional(sch, CONF_OPEN_CONTACT_SENSOR, o.get(CONF_OPEN_CONTACT_SENSOR, d.get(CONF_OPEN_CONTACT_SENSOR)), "binary_sensor")
+            sch[vol.Optional(CONF_REFERENCE_SENSORS, default=o.get(CONF_REFERENCE_SENSORS, d.get(CONF_REFERENCE_SENSORS, "")))] = str
+            _entity_optional(sch, CONF_POWER_SENSOR, o.get(CONF_POWER_SENSOR, d.get(CONF_POWER_SENSOR)), "sensor")
+            sch[vol.Optional(CONF_POWER_THRESHOLD, default=o.get(CONF_POWER_THRESHOLD, d.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD)))] = vol.Coerce(float)
+            sch[vol.Optional(CONF_RESYNC_WINDOW, default=o.get(CONF_RESYNC_WINDOW, d.get(CONF_RESYNC_WINDOW, "")))] = str
+            sch[vol.Optional(CONF_RESYNC_ERROR_BUDGET, default=o.get(CONF_RESYNC_ERROR_BUDGET, d.get(CONF_RESYNC_ERROR_BUDGET, 0)))] = vol.Coerce(float)
         return vol.Schema(sch)
@@ -7,6 +7,9 @@ DOMAIN: str = "cover_time_based_sync"
 # Chaves de configuração
 # -----------------------------#
 CONF_NAME: str = "name"
+# Definição em massa (YAML / import): opções partilhadas + lista de covers
+CONF_DEFAULTS: str = "defaults"
+CONF_COVERS: str = "covers"
 # Tempos (s) abrir/fechar
 CONF_TRAVELLING_TIME_UP: str = "travelling_time_up"
 CONF_TRAVELLING_TIME_DOWN: str = "travelling_time_down"
@@ -17,14 +20,30 @@ CONF_STOP_SCRIPT: str = "stop_script_entity_id"
 # Sensores binários (opcionais)
 CONF_CLOSE_CONTACT_SENSOR: str = "close_contact_sensor_entity_id"
 CONF_OPEN_CONTACT_SENSOR: str = "open_contact_sensor_entity_id"
+# Sensores de referência intermédios: "binary_sensor.reed_50=50, binary_sensor.reed_75=75"
+CONF_REFERENCE_SENSORS: str = "reference_sensors"
+# Sensor de potência/corrente do motor (tomada/relé): flancos ancoram arranque e paragem reais
+CONF_POWER_SENSOR: str = "power_sensor_entity_id"
+CONF_POWER_THRESHOLD: str = "power_threshold"  # W (ou A) acima do qual o motor está a andar
+# Resync em períodos calmos: janela "HH:MM-HH:MM" e orçamento de incerteza da posição (± %)
+CONF_RESYNC_WINDOW: str = "resync_window"
+CONF_RESYNC_ERROR_BUDGET: str = "resync_error_budget"
 # Comportamentos
 CONF_SEND_STOP_AT_ENDS: str = "send_stop_at_ends"
 CONF_ALWAYS_CONFIDENT: str = "always_confident"
 CONF_SMART_STOP: str = "smart_stop_midrange"
+# Latência de atuação (script/RF → motor a andar)
+CONF_ACTUATION_LATENCY_MS: str = "actuation_latency_ms"  # offset fixo
+CONF_MEASURE_LATENCY: str = "measure_actuation_latency"  # medir até ao evento script_started
+# Inversão de sentido: pausa do motor entre stop e arranque inverso; inversões demasiado rápidas ignoradas
+CONF_REVERSAL_DEAD_TIME_MS: str = "reversal_dead_time_ms"
+CONF_REVERSAL_GUARD_MS: str = "reversal_guard_ms"
 
 # --------- Controlo Único (RF) --------- #
 CONF_SINGLE_CONTROL_ENABLED: str = "single_control_enabled"
 CONF_SINGLE_CONTROL_PULSE_MS: str = "single_control_pulse_delay_ms"  # atraso entre pulsos
+CONF_SINGLE_CONTROL_CYCLE: str = "single_control_cycle"  # ciclo do botão, p.ex. "open,stop,close,stop"
+CONF_SINGLE_CONTROL_CHANNEL: str = "single_control_channel"  # canal RF partilhado (mesmo código do comando)
 
 # -----------------------------#
 # Serviços
@@ -32,15 +51,40 @@ CONF_SINGLE_CONTROL_PULSE_MS: str = "single_control_pulse_delay_ms"  # atraso en
 SERVICE_SET_KNOWN_POSITION: str = "set_known_position"
 SERVICE_SET_KNOWN_ACTION: str = "set_known_action"
 SERVICE_ACTIVATE_SCRIPT: str = "activate_script"  # novo serviço
+SERVICE_MOVE_SEQUENCE: str = "move_sequence"
+SERVICE_PROFILE: str = "profile"
 
 # Atributos aceites
 ATTR_POSITION: str = "position"  # 0..100
 ATTR_CONFIDENT: str = "confident"  # bool
 ATTR_POSITION_TYPE: str = "position_type"  # "current" | "target"
 ATTR_POSITION_TYPE_TARGET: str = "target"
+ATTR_POSITIONS: str = "positions"  # lista de waypoints (número ou {position, dwell})
+ATTR_DWELL: str = "dwell"  # pausa (s) em cada waypoint
+ATTR_DURATION: str = "duration"  # janela de profiling (s)
+ATTR_MODE: str = "mode"  # "timing" | "cprofile"
 
 # Ações
 ATTR_ACTION: str = "action"  # "open" | "close" | "stop"
 ACTION_OPEN: str = "open"
 ACTION_CLOSE: str = "close"
 ACTION_STOP: str = "stop"
+
+# -----------------------------#
+# Eventos (event bus)
+# -----------------------------#
+EVENT_MOTION_STARTED: str = f"{DOMAIN}_motion_started"
+EVENT_MOTION_FINISHED: str = f"{DOMAIN}_motion_finished"
+EVENT_CONTACT_CORRECTION: str = f"{DOMAIN}_contact_correction"
+EVENT_COMMAND_DROPPED: str = f"{DOMAIN}_command_dropped"
+EVENT_ACTUATION_FAILED: str = f"{DOMAIN}_actuation_failed"  # comando sem consumo no motor
+EVENT_PROFILE_FINISHED: str = f"{DOMAIN}_profile_finished"
+EVENT_RECONCILED: str = f"{DOMAIN}_reconciled"  # resumo da reconciliação no arranque
+EVENT_RESYNC_FINISHED: str = f"{DOMAIN}_resync_finished"  # resumo de um lote de resync
+
+# Origem do comando/movimento (campo 'source' dos eventos)
+SOURCE_COMMAND: str = "command"  # entidade cover (UI / cover.*)
+SOURCE_SERVICE: str = "service"  # serviços do domínio (dispatcher)
+SOURCE_CONTACT: str = "contact"  # sensores de contacto
+SOURCE_RESYNC: str = "resync"  # recalibração em período calmo
+SOURCE_CHANNEL: str = "rf_channel"  # pulso de outro membro do canal RF
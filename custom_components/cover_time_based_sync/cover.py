@@ -5,15 +5,16 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import Any, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
 from homeassistant.components.cover import (
     CoverEntity,
     CoverEntityFeature,
@@ -33,22 +34,75 @@ from .const import (
     CONF_NAME as CONF_FRIENDLY_NAME,
     CONF_OPEN_CONTACT_SENSOR,
     CONF_CLOSE_CONTACT_SENSOR,
+    CONF_REFERENCE_SENSORS,
     CONF_SINGLE_CONTROL_ENABLED,
     CONF_SINGLE_CONTROL_PULSE_MS,
+    CONF_SINGLE_CONTROL_CYCLE,
+    CONF_SINGLE_CONTROL_CHANNEL,
+    CONF_ACTUATION_LATENCY_MS,
+    CONF_MEASURE_LATENCY,
+    CONF_REVERSAL_DEAD_TIME_MS,
+    CONF_REVERSAL_GUARD_MS,
+    CONF_POWER_SENSOR,
+    CONF_POWER_THRESHOLD,
+    CONF_RESYNC_WINDOW,
+    CONF_RESYNC_ERROR_BUDGET,
     ATTR_CONFIDENT,
     ATTR_POSITION_TYPE,
+    EVENT_MOTION_STARTED,
+    EVENT_MOTION_FINISHED,
+    EVENT_CONTACT_CORRECTION,
+    EVENT_COMMAND_DROPPED,
+    EVENT_ACTUATION_FAILED,
+    SOURCE_COMMAND,
+    SOURCE_SERVICE,
+    SOURCE_CONTACT,
+    SOURCE_RESYNC,
+    SOURCE_CHANNEL,
 )
-from .travelcalculator import TravelCalculator
+from .bulk import CoverEntryView, build_cover_configs, cover_key, is_bulk
+from .live import async_notify as async_notify_live
+from .coalesce import get_coalescer
+from .pacing import get_pacer
+from .profiler import SIGNAL_PROFILE_REBIND
+from .reconcile import (
+    REASON_CONTACT_CONFLICT,
+    REASON_CONTACT_MISMATCH,
+    REASON_INTERRUPTED,
+    REASON_NO_STATE,
+    async_report,
+)
+from .resync import async_register as async_register_resync, async_unregister as async_unregister_resync, in_window, parse_window
+from .rfchannel import RfChannel, async_join as async_join_rf_channel, async_leave as async_leave_rf_channel
+from .rfcycle import ButtonCycle, CycleTracker
+from .supervisor import TaskSupervisor
+from .travelcalculator import DRIFT_PER_TRAVEL, UNCERTAINTY_MAX, TravelCalculator, TravelStatus
 
 _LOGGER = logging.getLogger(__name__)
 SIGNAL_SET_KNOWN_POSITION = f"{DOMAIN}_set_known_position"
 SIGNAL_SET_KNOWN_ACTION = f"{DOMAIN}_set_known_action"
 SIGNAL_ACTIVATE_SCRIPT = f"{DOMAIN}_activate_script"
+SIGNAL_MOVE_SEQUENCE = f"{DOMAIN}_move_sequence"
 
 DEFAULT_TRAVEL_TIME = 25
 MID_RANGE_LOW = 20
 MID_RANGE_HIGH = 80
-UPDATE_INTERVAL_SEC = 0.5  # solicitado
+LATENCY_EWMA_ALPHA = 0.2  # suavização da latência medida
+SCRIPT_STARTED_TIMEOUT_SEC = 10.0  # sem script_started até aqui: amostra de latência descartada
+EVENT_SCRIPT_STARTED = "script_started"  # disparado pelo HA quando uma execução de script arranca
+ACTUATION_MAX_AGE_SEC = 10.0  # instantes de atuação mais antigos são ignorados
+DEFAULT_POWER_THRESHOLD = 5.0
+POWER_START_TIMEOUT_SEC = 3.0  # sem consumo após a atuação (+ latência) → atuação falhada
+POWER_ANCHOR_WINDOW_SEC = 5.0  # flanco de subida até este tempo antes do arranque estimado ainda ancora
+POWER_LATE_STOP_SEC = 5.0  # flanco de descida após o fim estimado ainda corrige a posição final
+LEARN_EWMA_ALPHA = 0.3  # suavização dos tempos de viagem aprendidos
+LEARN_MIN_DISTANCE = 10.0  # troço mínimo (%) para aprender tempo de viagem
+RESYNC_IDLE_SEC = 600.0  # cover parada há pelo menos isto antes de um resync
+# Incerteza da posição (± %, TravelCalculator)
+REFERENCE_UNCERTAINTY = 1.0  # resíduo num sensor de referência (largura da zona de deteção)
+UNCERTAINTY_SKIP_STOP = 2.0  # abaixo disto, parada no alvo: stop redundante não é enviado
+UNCERTAINTY_OVERRUN = 2.0  # acima disto, movimento para um extremo prolonga-se pela incerteza
+OVERRUN_MARGIN = 2.0  # % de curso extra no prolongamento
 
 # Direções
 DIR_UP = "up"
@@ -58,6 +112,9 @@ NEXT_OPEN = "open"
 NEXT_CLOSE = "close"
 NEXT_STOP = "stop"
 
+# Estados de sensor que não são leituras (transição daqui para "off" não é movimento)
+_NO_READING = (None, "unknown", "unavailable")
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -65,15 +122,32 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     hass.data.setdefault(DOMAIN, {})
-    entity = TimeBasedSyncCover(hass, entry)
-    hass.data[DOMAIN][entry.entry_id] = {"entity": entity}
-    async_add_entities([entity], update_before_add=False)
+    supervisor = TaskSupervisor(f"{DOMAIN}.{entry.entry_id}")
+    if is_bulk(entry.data):
+        entities = [
+            TimeBasedSyncCover(hass, view, supervisor=supervisor)
+            for view in _bulk_views(entry.entry_id, entry.data)
+        ]
+    else:
+        entities = [TimeBasedSyncCover(hass, entry, supervisor=supervisor)]
+    hass.data[DOMAIN][entry.entry_id] = {"entities": entities, "supervisor": supervisor}
+    async_add_entities(entities, update_before_add=False)
 
     async def _async_update_listener(updated_entry: ConfigEntry) -> None:
-        ent: TimeBasedSyncCover = hass.data[DOMAIN][updated_entry.entry_id]["entity"]
-        ent.apply_entry(updated_entry)
-        ent._publish_state()  # publicar estado coerente após update
-        _LOGGER.debug("Entry %s updated; entity refreshed", updated_entry.entry_id)
+        ents: list[TimeBasedSyncCover] = hass.data[DOMAIN][updated_entry.entry_id]["entities"]
+        if is_bulk(updated_entry.data):
+            views = {v.entry_id: v for v in _bulk_views(updated_entry.entry_id, updated_entry.data)}
+            if set(views) != {ent.entry.entry_id for ent in ents}:
+                # Covers adicionadas/removidas: recarregar a entry
+                hass.config_entries.async_schedule_reload(updated_entry.entry_id)
+                return
+            pairs = [(ent, views[ent.entry.entry_id]) for ent in ents]
+        else:
+            pairs = [(ent, updated_entry) for ent in ents]
+        for ent, ent_entry in pairs:
+            ent.apply_entry(ent_entry)
+            ent._publish_state()  # publicar estado coerente após update
+        _LOGGER.debug("Entry %s updated; %d entities refreshed", updated_entry.entry_id, len(pairs))
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
@@ -84,9 +158,20 @@ async def async_setup_platform(
     async_add_entities_cb: AddEntitiesCallback,
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
-    entry_like = type("EntryLike", (), {"data": config, "options": {}, "entry_id": "yaml"})()
-    entity = TimeBasedSyncCover(hass, entry_like)
-    async_add_entities_cb([entity], update_before_add=False)
+    if is_bulk(config):
+        entities = [TimeBasedSyncCover(hass, view) for view in _bulk_views("yaml", config)]
+    else:
+        entities = [TimeBasedSyncCover(hass, CoverEntryView("yaml", config))]
+    # Um único registo para todo o bloco
+    async_add_entities_cb(entities, update_before_add=False)
+
+
+def _bulk_views(prefix: str, config: ConfigType) -> list[CoverEntryView]:
+    """Valida o bloco numa passagem (erros registados) e devolve uma vista por cover válida."""
+    configs, errors = build_cover_configs(config)
+    for err in errors:
+        _LOGGER.error("Definição em massa '%s' inválida: %s", prefix, err)
+    return [CoverEntryView(f"{prefix}_{cover_key(cfg)}", cfg) for cfg in configs]
 
 
 class TimeBasedSyncCover(CoverEntity, RestoreEntity):
@@ -94,15 +179,106 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
 
     _attr_assumed_state = True  # dinâmica: False enquanto está em movimento
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Atraso do event loop muda a cada escrita: visível na entidade, fora do recorder
+    _unrecorded_attributes = frozenset({"loop_lag_ms"})
+
+    # Estado próprio em slots (sem entrada no __dict__ da entidade): frotas de milhares de covers.
+    # Os atributos do HA (hass, entity_id, _attr_*) continuam no __dict__ da classe base.
+    __slots__ = (
+        "entry",
+        "_owns_supervisor",
+        "_supervisor",
+        # Estado principal e movimento corrente
+        "_position",
+        "_moving_task",
+        "_moving_direction",
+        "_last_confident_state",
+        "_motion_from",
+        "_motion_target",
+        "_motion_source",
+        "_motion_started_at",
+        "_motion_finished_at",
+        "_halted_at",
+        # Subscrições
+        "_unsub_known_position",
+        "_unsub_known_action",
+        "_unsub_close_contact",
+        "_unsub_open_contact",
+        "_unsub_reference",
+        "_unsub_power",
+        "_unsub_activate_script",
+        "_unsub_move_sequence",
+        "_unsub_profile_rebind",
+        "_added_to_hass",
+        "_subscribed_ids",
+        # Cálculo e sincronização
+        "_calc",
+        "_pacer",
+        "_coalescer",
+        "_op_lock",
+        # Opções
+        "_travel_up",
+        "_travel_down",
+        "_send_stop_at_ends",
+        "_always_confident",
+        "_smart_stop_midrange",
+        "_open_script_id",
+        "_close_script_id",
+        "_stop_script_id",
+        "_resync_window",
+        "_resync_budget",
+        "_reversal_dead_s",
+        "_reversal_guard_s",
+        # Sensores opcionais e motor observado
+        "_close_contact_sensor_id",
+        "_open_contact_sensor_id",
+        "_reference_sensors",
+        "_power_sensor_id",
+        "_power_threshold",
+        "_power_on",
+        "_power_rise_at",
+        "_power_anchored",
+        "_power_segment",
+        "_cancel_power_watchdog",
+        "_rf_rollback",
+        # Aprendizagem de tempos de viagem
+        "_segment_anchored",
+        "_learned_travel",
+        # Modo RF
+        "_single_control_enabled",
+        "_single_control_script_id",
+        "_single_pulse_delay_ms",
+        "_single_next_action",
+        "_rf",
+        "_rf_channel_name",
+        "_rf_channel",
+        # Latência de atuação
+        "_latency_offset_s",
+        "_measure_latency",
+        "_latency_ewma",
+        "_actuated_at",
+    )
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, supervisor: TaskSupervisor | None = None) -> None:
         self.hass = hass
         self.entry = entry
+        # Tasks de fundo: do supervisor da entry, ou próprio (YAML) — encerrado na remoção
+        self._owns_supervisor = supervisor is None
+        self._supervisor = supervisor or TaskSupervisor(f"{DOMAIN}.{getattr(entry, 'entry_id', 'default')}")
 
         # Estado principal
         self._position: int = 0
         self._moving_task: Optional[asyncio.Task] = None
         self._moving_direction: Optional[str] = None
         self._last_confident_state: Optional[bool] = None
+        # Movimento corrente (para eventos no event bus)
+        self._motion_from: Optional[int] = None
+        self._motion_target: Optional[int] = None
+        self._motion_source: str = SOURCE_COMMAND
+        self._motion_started_at: Optional[float] = None
+        self._motion_finished_at: Optional[float] = None
+        # Inversão de sentido: instante (monotónico) em que o motor parou antes de inverter
+        self._halted_at: Optional[float] = None
         self._attr_unique_id = f"{DOMAIN}_{getattr(entry, 'entry_id', 'default')}"
         self._attr_supported_features = CoverEntityFeature.SET_POSITION
 
@@ -111,21 +287,53 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
         self._unsub_known_action = None
         self._unsub_close_contact = None
         self._unsub_open_contact = None
+        self._unsub_reference = None
+        self._unsub_power = None
         self._unsub_activate_script = None
+        self._unsub_move_sequence = None
+        self._unsub_profile_rebind = None
+        self._added_to_hass = False
+        self._subscribed_ids: dict[str, tuple[str, ...]] = {}
 
         # Cálculo e sincronização
         self._calc: TravelCalculator | None = None
+        self._pacer = get_pacer(hass)  # ritmo de publicação partilhado (atraso do event loop)
+        self._coalescer = get_coalescer(hass)  # scripts partilhados entre covers (modo Standard)
         self._op_lock = asyncio.Lock()  # serializa comandos de alto nível
 
         # Sensores opcionais
         self._close_contact_sensor_id: Optional[str] = None
         self._open_contact_sensor_id: Optional[str] = None
+        self._reference_sensors: dict[str, int] = {}
+        self._power_sensor_id: Optional[str] = None
+        self._power_threshold: float = DEFAULT_POWER_THRESHOLD
+
+        # Motor observado pelo sensor de potência
+        self._power_on: Optional[bool] = None  # None = sem leitura
+        self._power_rise_at: Optional[float] = None
+        self._power_anchored: bool = False
+        self._power_segment: Optional[dict[str, float]] = None  # último troço (correção de paragem tardia)
+        self._cancel_power_watchdog = None
+        self._rf_rollback: Optional[int] = None
+
+        # Aprendizagem de tempos de viagem (troços entre pontos de referência)
+        self._segment_anchored: bool = False
+        self._learned_travel: dict[str, float] = {}
 
         # Modo RF (single button)
         self._single_control_enabled: bool = False
         self._single_control_script_id: Optional[str] = None
         self._single_pulse_delay_ms: int = 400
         self._single_next_action: str = NEXT_OPEN
+        self._rf: CycleTracker = CycleTracker(ButtonCycle.parse(None))
+        self._rf_channel_name: str = ""  # canal RF partilhado (mesmo código do comando)
+        self._rf_channel: RfChannel | None = None
+
+        # Latência de atuação (script → motor)
+        self._latency_offset_s: float = 0.0
+        self._measure_latency: bool = False
+        self._latency_ewma: Optional[float] = None
+        self._actuated_at: Optional[float] = None
 
         self.apply_entry(entry)
 
@@ -137,6 +345,30 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
         options = dict(getattr(self.entry, "options", {}) or {})
         return options.get(key, data.get(key, default))
 
+    def _ms_option(self, key: str) -> float:
+        """Opção em ms (vazia/ inválida → 0) convertida para segundos."""
+        try:
+            return max(0.0, float(self._opt_or_data(key, 0) or 0) / 1000.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    @staticmethod
+    def _parse_reference_sensors(value: Any) -> dict[str, int]:
+        """Aceita dict {entity_id: posição} ou texto "binary_sensor.a=50, binary_sensor.b=75"."""
+        if not value:
+            return {}
+        if isinstance(value, dict):
+            items = list(value.items())
+        else:
+            items = [part.split("=", 1) for part in str(value).split(",") if "=" in part]
+        refs: dict[str, int] = {}
+        for entity_id, pos in items:
+            try:
+                refs[str(entity_id).strip()] = max(0, min(100, int(round(float(pos)))))
+            except (TypeError, ValueError):
+                _LOGGER.warning("Sensor de referência inválido ignorado: %s=%s", entity_id, pos)
+        return refs
+
     def _first_script(self) -> Optional[str]:
         for key in (CONF_OPEN_SCRIPT, CONF_CLOSE_SCRIPT, CONF_STOP_SCRIPT):
             val = self._opt_or_data(key)
@@ -164,10 +396,104 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
             self._update_supported_features()
         self.async_write_ha_state()
 
+    def _expected_next_action(self) -> str:
+        """Em RF, a ação que o próximo pulso produz no ciclo; senão STOP em movimento ou pela posição."""
+        if self._single_control_enabled:
+            return self._rf.next_action()
+        if self._moving_direction is not None:
+            return NEXT_STOP
+        return NEXT_OPEN if self._position == 0 else NEXT_CLOSE if self._position == 100 else NEXT_STOP
+
+    def _rf_assume_rest(self, *, definite: bool = False) -> None:
+        """Motor parado sem observação do ciclo: hipótese principal pela posição, restantes em aberto."""
+        cycle = self._rf.cycle
+        if self._position == 0:
+            primary = cycle.settle(cycle.indices(NEXT_CLOSE)[0])
+        elif self._position == 100:
+            primary = cycle.settle(cycle.indices(NEXT_OPEN)[0])
+        else:
+            primary = cycle.settle(self._rf.index)
+        if definite and self._position in (0, 100):
+            self._rf.assume(primary)
+        else:
+            self._rf.assume_rest(primary)
+
+    def _rf_idle_at(self, position: int) -> bool:
+        """Parado no fim de curso pedido: pulsar só gastaria tempo de RF (e arrancaria o motor)."""
+        return self._moving_direction is None and self._position == position
+
+    # ------------------------------
+    # Canal RF partilhado
+    # ------------------------------
+    def _sync_rf_channel(self) -> None:
+        """Junta/retira a cover do canal RF configurado (os membros partilham o CycleTracker)."""
+        channel = self._rf_channel
+        if channel is not None and channel.name == self._rf_channel_name and self._rf is channel.tracker:
+            return
+        if channel is not None:
+            async_leave_rf_channel(self.hass, channel, self)
+            self._rf_channel = None
+            if self._rf is channel.tracker:
+                # Cópia própria: os restantes membros continuam com o passo partilhado
+                self._rf = CycleTracker(self._rf.cycle, self._rf.index)
+        if self._rf_channel_name:
+            self._rf_channel = async_join_rf_channel(self.hass, self._rf_channel_name, self, self._rf)
+            if self._rf_channel is not None:
+                self._rf = self._rf_channel.tracker
+
+    @callback
+    def follow_channel(self, action: str, at: Optional[float]) -> None:
+        """Outro membro do canal pulsou até 'action': este motor também reagiu (sem pulsos próprios)."""
+        # Task própria: quem pulsou pode estar à espera do _op_lock desta cover
+        self._supervisor.create_task(self._async_follow_channel(action, at), name=f"{DOMAIN} channel {self.entity_id}")
+
+    @callback
+    def channel_state_changed(self) -> None:
+        """O passo partilhado do ciclo mudou noutro membro (fim de curso): republica a próxima ação."""
+        self._single_next_action = self._expected_next_action()
+        self._publish_state()
+
+    async def _async_follow_channel(self, action: str, at: Optional[float]) -> None:
+        async with self._op_lock:
+            direction = {NEXT_OPEN: DIR_UP, NEXT_CLOSE: DIR_DOWN}.get(action)
+            end = 100 if direction == DIR_UP else 0
+            if action == NEXT_STOP and self._moving_direction is not None:
+                self._actuated_at = at
+                await self._stop_motion()
+            elif direction is not None and self._moving_direction != direction and not self._rf_idle_at(end):
+                # Um comando próprio no mesmo sentido já em curso mantém o seu alvo
+                self._actuated_at = at
+                await self._move_to_target(end, drive_scripts=False, source=SOURCE_CHANNEL)
+            else:
+                self._single_next_action = self._expected_next_action()
+                self._publish_state()
+
     async def _set_next_action(self, next_action: str) -> None:
         self._single_next_action = next_action
         self._publish_state()
 
+    def _notify_live(self) -> None:
+        """Troço/posição mudou: empurra aos subscritores websocket (sem escrita no state machine)."""
+        if self.hass is not None and self.entity_id is not None:
+            async_notify_live(self.hass, self)
+
+    def live_segment(self) -> Optional[dict[str, float]]:
+        """Troço em curso do TravelCalculator (None se parado) — para posições ao vivo."""
+        return self._calc.segment() if self._calc else None
+
+    def live_position(self) -> float:
+        return self._calc.current_position() if self._calc else float(self._position)
+
+    def _fire_event(self, event_type: str, **data: Any) -> None:
+        """Dispara um evento compacto no event bus (sempre com entity_id)."""
+        if self.hass is None or self.entity_id is None:
+            return
+        self.hass.bus.async_fire(event_type, {"entity_id": self.entity_id, **data})
+
+    def _command_dropped(self, command: str, reason: str, source: str = SOURCE_COMMAND) -> None:
+        self._fire_event(EVENT_COMMAND_DROPPED, command=command, reason=reason, source=source, position=self._position)
+        _LOGGER.debug("%s: comando '%s' ignorado (%s)", self.entity_id, command, reason)
+
     def _log_state(self, event: str, extra: dict | None = None) -> None:
         _LOGGER.debug(
             "%s: pos=%s dir=%s next=%s moving=%s features=%s %s",
@@ -223,6 +549,12 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
 
         self._close_contact_sensor_id = self._opt_or_data(CONF_CLOSE_CONTACT_SENSOR)
         self._open_contact_sensor_id = self._opt_or_data(CONF_OPEN_CONTACT_SENSOR)
+        self._reference_sensors = self._parse_reference_sensors(self._opt_or_data(CONF_REFERENCE_SENSORS))
+        self._power_sensor_id = self._opt_or_data(CONF_POWER_SENSOR) or None
+        try:
+            self._power_threshold = float(self._opt_or_data(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD))
+        except (TypeError, ValueError):
+            self._power_threshold = DEFAULT_POWER_THRESHOLD
 
         self._single_control_enabled = bool(self._opt_or_data(CONF_SINGLE_CONTROL_ENABLED, False))
         self._single_control_script_id = (
@@ -231,13 +563,44 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
             else None
         )
         self._single_pulse_delay_ms = int(self._opt_or_data(CONF_SINGLE_CONTROL_PULSE_MS, 400))
+        try:
+            cycle = ButtonCycle.parse(self._opt_or_data(CONF_SINGLE_CONTROL_CYCLE))
+        except ValueError as exc:
+            _LOGGER.warning("%s: %s; a usar o ciclo por omissão", self._attr_name, exc)
+            cycle = ButtonCycle.parse(None)
+        if cycle.steps != self._rf.cycle.steps:
+            # Ciclo novo: o passo atual deixa de ser conhecido
+            self._rf = CycleTracker(cycle)
+            self._rf_assume_rest()
+        self._rf_channel_name = (
+            str(self._opt_or_data(CONF_SINGLE_CONTROL_CHANNEL) or "").strip() if self._single_control_enabled else ""
+        )
+        self._latency_offset_s = max(0.0, float(self._opt_or_data(CONF_ACTUATION_LATENCY_MS, 0) or 0) / 1000.0)
+        self._measure_latency = bool(self._opt_or_data(CONF_MEASURE_LATENCY, False))
+        self._reversal_dead_s = self._ms_option(CONF_REVERSAL_DEAD_TIME_MS)
+        self._reversal_guard_s = self._ms_option(CONF_REVERSAL_GUARD_MS)
+        try:
+            self._resync_window = parse_window(self._opt_or_data(CONF_RESYNC_WINDOW))
+        except ValueError as exc:
+            _LOGGER.warning("%s: %s; resync desativado", self._attr_name, exc)
+            self._resync_window = None
+        try:
+            self._resync_budget = max(0.0, float(self._opt_or_data(CONF_RESYNC_ERROR_BUDGET, 0) or 0))
+        except (TypeError, ValueError):
+            self._resync_budget = 0.0
 
         if self._calc is None:
             self._calc = TravelCalculator(self._travel_down, self._travel_up)
+            self._calc.set_position(float(self._position))
         else:
-            self._calc.travel_time_down = self._travel_down
-            self._calc.travel_time_up = self._travel_up
-        self._calc.set_position(float(self._position))
+            # Incremental: um movimento em curso continua, re-escalado para os novos tempos
+            self._calc.set_travel_times(self._travel_down, self._travel_up)
+
+        # Já adicionada: re-subscrever apenas os sensores cujo entity_id mudou
+        if self._added_to_hass:
+            self._sync_sensor_subscriptions()
+            self._sync_rf_channel()
+            self._notify_live()
 
         self._update_supported_features()
         self._log_state("apply_entry")
@@ -250,41 +613,114 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
                 self._position = int(pos)
             except (TypeError, ValueError):
                 pass
+        # Passo do ciclo RF: o último conhecido é a hipótese principal, mas o comando físico
+        # pode ter sido usado entretanto — ambíguo até um sensor de contacto o confirmar.
+        if last and last.attributes.get("single_control_cycle") == str(self._rf.cycle):
+            try:
+                self._rf.assume(int(last.attributes.get("single_control_cycle_index")))
+            except (TypeError, ValueError):
+                pass
 
         if self._calc is None:
             self._calc = TravelCalculator(self._travel_down, self._travel_up)
-        self._calc.set_position(float(self._position))
-
-        await self._set_next_action(NEXT_OPEN if self._position == 0 else NEXT_CLOSE if self._position == 100 else NEXT_STOP)
+        # Reconciliação silenciosa (sem scripts/eventos) e uma única publicação por cover
+        reason = self._reconcile_boot(last)
+        # Canal RF: o primeiro membro define o passo do ciclo; os seguintes adotam o partilhado
+        self._sync_rf_channel()
+        self._single_next_action = self._expected_next_action()
         self._publish_state()
-        self._log_state("added_to_hass")
+        async_report(self.hass, self.entity_id, self._position, bool(self._last_confident_state), reason)
+        self._log_state("added_to_hass", {"resync": reason})
 
-        self._unsub_known_position = async_dispatcher_connect(
-            self.hass, SIGNAL_SET_KNOWN_POSITION, self._dispatcher_set_known_position
-        )
-        self._unsub_known_action = async_dispatcher_connect(
-            self.hass, SIGNAL_SET_KNOWN_ACTION, self._dispatcher_set_known_action
-        )
-        self._unsub_activate_script = async_dispatcher_connect(
-            self.hass, SIGNAL_ACTIVATE_SCRIPT, self._dispatcher_activate_script
+        self._connect_dispatchers()
+        self._unsub_profile_rebind = async_dispatcher_connect(
+            self.hass, SIGNAL_PROFILE_REBIND, self._connect_dispatchers
         )
 
-        # Sensores de contacto (opcionais)
-        if self._close_contact_sensor_id:
-            self._unsub_close_contact = async_track_state_change_event(
-                self.hass, [self._close_contact_sensor_id], self._closed_contact_state_changed
-            )
-            st = self.hass.states.get(self._close_contact_sensor_id)
-            if st and str(st.state).lower() == "off":
-                await self._apply_contact_hit(0, source_entity=self._close_contact_sensor_id)
-
-        if self._open_contact_sensor_id:
-            self._unsub_open_contact = async_track_state_change_event(
-                self.hass, [self._open_contact_sensor_id], self._open_contact_state_changed
-            )
-            st = self.hass.states.get(self._open_contact_sensor_id)
-            if st and str(st.state).lower() == "off":
-                await self._apply_contact_hit(100, source_entity=self._open_contact_sensor_id)
+        # Sensores de contacto / referência / potência (opcionais)
+        self._added_to_hass = True
+        self._sync_sensor_subscriptions()
+        if self._power_sensor_id:
+            self._power_on = self._power_reading(self.hass.states.get(self._power_sensor_id))
+        async_register_resync(self.hass, self)
+
+    def _contact_reading(self, entity_id: Optional[str]) -> Optional[bool]:
+        """Leitura de um contacto: True = íman presente ("off"), False = afastado ("on"), None = sem leitura."""
+        st = self.hass.states.get(entity_id) if entity_id else None
+        state = str(st.state).lower() if st else None
+        return True if state == "off" else False if state == "on" else None
+
+    def _reconcile_boot(self, last: Any) -> Optional[str]:
+        """Posição no arranque a partir do estado restaurado, dos contactos e de movimento interrompido.
+
+        Não atua, não dispara eventos nem publica. Devolve o motivo se a cover ainda precisa de resync.
+        """
+        at_closed = self._contact_reading(self._close_contact_sensor_id)
+        at_open = self._contact_reading(self._open_contact_sensor_id)
+        last_state = str(last.state) if last else None
+        reason: Optional[str] = None
+        uncertainty = UNCERTAINTY_MAX
+
+        if at_closed and at_open:
+            reason = REASON_CONTACT_CONFLICT
+        elif at_closed or at_open:
+            self._position = 0 if at_closed else 100
+            self._rf.observe_end(NEXT_CLOSE if at_closed else NEXT_OPEN)
+            self._last_confident_state = True
+            uncertainty = 0.0
+        elif last is None:
+            reason = REASON_NO_STATE
+        elif last_state in ("opening", "closing"):
+            # Movimento interrompido pelo restart: sem o stop pendente, o motor seguiu até ao fim de curso
+            self._position = 100 if last_state == "opening" else 0
+            reason = REASON_INTERRUPTED
+        elif (self._position == 0 and at_closed is False) or (self._position == 100 and at_open is False):
+            reason = REASON_CONTACT_MISMATCH
+        else:
+            self._last_confident_state = last.attributes.get("position_confident")
+            try:
+                uncertainty = float(last.attributes["position_uncertainty"])
+            except (KeyError, TypeError, ValueError):
+                uncertainty = 0.0 if self._last_confident_state else UNCERTAINTY_MAX
+
+        if not (at_closed or at_open) or reason:
+            self._rf_assume_rest()
+        if reason:
+            self._last_confident_state = False
+        self._calc.set_position(float(self._position), uncertainty=uncertainty)
+        return reason
+
+    @callback
+    def _connect_dispatchers(self) -> None:
+        """(Re)liga os handlers dos serviços — também quando o profiler troca/repõe os métodos da classe."""
+        for slot, signal, handler in (
+            ("_unsub_known_position", SIGNAL_SET_KNOWN_POSITION, self._dispatcher_set_known_position),
+            ("_unsub_known_action", SIGNAL_SET_KNOWN_ACTION, self._dispatcher_set_known_action),
+            ("_unsub_activate_script", SIGNAL_ACTIVATE_SCRIPT, self._dispatcher_activate_script),
+            ("_unsub_move_sequence", SIGNAL_MOVE_SEQUENCE, self._dispatcher_move_sequence),
+        ):
+            if unsub := getattr(self, slot):
+                unsub()
+            setattr(self, slot, async_dispatcher_connect(self.hass, signal, handler))
+
+    def _sync_sensor_subscriptions(self) -> None:
+        """(Re)subscreve os sensores de contacto/referência — apenas os que mudaram."""
+        wanted = (
+            ("_unsub_close_contact", (self._close_contact_sensor_id,) if self._close_contact_sensor_id else (), self._closed_contact_state_changed),
+            ("_unsub_open_contact", (self._open_contact_sensor_id,) if self._open_contact_sensor_id else (), self._open_contact_state_changed),
+            ("_unsub_reference", tuple(sorted(self._reference_sensors)), self._reference_state_changed),
+            ("_unsub_power", (self._power_sensor_id,) if self._power_sensor_id else (), self._power_state_changed),
+        )
+        for slot, ids, handler in wanted:
+            if self._subscribed_ids.get(slot, ()) == ids:
+                continue
+            if unsub := getattr(self, slot):
+                unsub()
+                setattr(self, slot, None)
+            if ids:
+                setattr(self, slot, async_track_state_change_event(self.hass, list(ids), handler))
+            self._subscribed_ids[slot] = ids
+            _LOGGER.debug("%s: subscrição %s → %s", self.entity_id, slot, ids)
 
     async def async_will_remove_from_hass(self) -> None:
         for unsub in (
@@ -292,69 +728,165 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
             "_unsub_known_action",
             "_unsub_close_contact",
             "_unsub_open_contact",
+            "_unsub_reference",
+            "_unsub_power",
             "_unsub_activate_script",
+            "_unsub_move_sequence",
+            "_unsub_profile_rebind",
         ):
             func = getattr(self, unsub)
             if func:
                 func()
                 setattr(self, unsub, None)
+        self._added_to_hass = False
+        self._subscribed_ids.clear()
+        async_unregister_resync(self.hass, self)
+        if self._rf_channel is not None:
+            async_leave_rf_channel(self.hass, self._rf_channel, self)
+            self._rf_channel = None
+        self._disarm_power_watchdog()
+        # Sem runners órfãos após remoção/reload
+        await self._cancel_move_task()
+        if self._owns_supervisor:
+            await self._supervisor.async_shutdown()
 
     # ------------------------------
     # RF helpers (pulsos) & scripts
     # ------------------------------
-    async def _single_pulse(self) -> None:
+    def _latency_s(self) -> float:
+        """Latência estimada (s) entre a chamada do script e o motor reagir."""
+        measured = self._latency_ewma if self._measure_latency and self._latency_ewma is not None else 0.0
+        return self._latency_offset_s + measured
+
+    def _take_actuation_time(self) -> Optional[float]:
+        """Consome o instante (monotónico) estimado da última atuação física, se recente."""
+        at, self._actuated_at = self._actuated_at, None
+        if at is None or time.monotonic() - at > ACTUATION_MAX_AGE_SEC:
+            return None
+        return at
+
+    async def _call_script(self, entity_id: str, *, coalesce: bool = False) -> None:
+        """Chama script.turn_on e regista o instante estimado em que o motor reage.
+
+        Com 'coalesce' uma chamada idêntica de outra cover dentro da janela é reutilizada (mesmo início).
+        """
+        started = time.monotonic()
+        if self._measure_latency:
+            self._sample_script_start(entity_id, started)
+        if coalesce:
+            started = await self._coalescer.call(
+                entity_id, conflicts=(self._open_script_id, self._close_script_id, self._stop_script_id)
+            )
+        else:
+            await self.hass.services.async_call("script", "turn_on", {"entity_id": entity_id}, blocking=False)
+        self._actuated_at = started + self._latency_s()
+
+    @callback
+    def _sample_script_start(self, entity_id: str, called_at: float) -> None:
+        """Amostra de latência: chamada → script_started desse script (fila do modo do script incluída).
+
+        Sem esperar pelo script nem segurar o _op_lock; a amostra vale para as atuações seguintes.
+        """
+        unsubs: list[Any] = []
+
+        @callback
+        def _done() -> None:
+            while unsubs:
+                unsubs.pop()()
+
+        @callback
+        def _started(event) -> None:
+            if event.data.get("entity_id") != entity_id:
+                return
+            _done()
+            sample = time.monotonic() - called_at
+            prev = self._latency_ewma
+            self._latency_ewma = sample if prev is None else prev + LATENCY_EWMA_ALPHA * (sample - prev)
+
+        @callback
+        def _expired(_now: Any) -> None:
+            unsubs.pop(0)  # o próprio timer
+            _done()
+
+        unsubs.append(async_call_later(self.hass, SCRIPT_STARTED_TIMEOUT_SEC, _expired))
+        unsubs.append(self.hass.bus.async_listen(EVENT_SCRIPT_STARTED, _started))
+
+    async def _single_pulse(self) -> bool:
         if not self._single_control_enabled or not self._single_control_script_id:
-            return
+            return False
         try:
-            await self.hass.services.async_call(
-                "script", "turn_on", {"entity_id": self._single_control_script_id}, blocking=False
-            )
+            await self._call_script(self._single_control_script_id)
         except Exception as exc:  # noqa: BLE001
             _LOGGER.warning("Falha ao executar script (single RF) %s: %s", self._single_control_script_id, exc)
+            return False
+        return True
 
-    async def _single_pulses(self, count: int) -> None:
-        delay = max(0.05, self._single_pulse_delay_ms / 1000.0)
-        for _ in range(max(0, count)):
-            await self._single_pulse()
-            await asyncio.sleep(delay)
-
-    async def _ensure_action_single(self, target_action: str) -> None:
-        """Decide o número de pulsos com base no estado e atualiza next_action. Não publica estado."""
-        opening = self.is_opening
-        closing = self.is_closing
-
-        if target_action == NEXT_STOP:
-            if opening or closing:  # STOP só em movimento
-                await self._single_pulses(1)
-                # Próxima ação alterna consoante sentido anterior
-                self._single_next_action = NEXT_CLOSE if opening else NEXT_OPEN
-            return
-
-        if target_action == NEXT_OPEN:
-            if opening:
-                await self._single_pulses(1)
-            elif closing:
-                await self._single_pulses(2)  # parar + abrir
-            else:
-                await self._single_pulses(1)
-            self._single_next_action = NEXT_STOP
+    def _drift_position(self, action: str, seconds: float) -> None:
+        """Movimento breve do motor num passo intermédio do ciclo (entre dois pulsos)."""
+        if self._calc is None or action == NEXT_STOP:
             return
+        travel = self._travel_up if action == NEXT_OPEN else self._travel_down
+        delta = seconds * 100.0 / max(travel, 0.1)
+        pos = self._calc.current_position() + (delta if action == NEXT_OPEN else -delta)
+        self._calc.set_position(max(0.0, min(100.0, pos)))
+        self._position = int(round(self._calc.current_position()))
 
-        if target_action == NEXT_CLOSE:
-            if closing:
-                await self._single_pulses(1)
-            elif opening:
-                await self._single_pulses(2)  # parar + fechar
-            else:
-                await self._single_pulses(1)
-            self._single_next_action = NEXT_STOP
+    async def _ensure_action_single(self, target_action: str) -> None:
+        """Envia o nº mínimo de pulsos para levar o ciclo do motor a 'target_action'. Não publica estado."""
+        channel = self._rf_channel
+        if channel is None:
+            await self._pulse_plan(target_action)
             return
+        # Canal partilhado: uma sequência de cada vez; quem chega depois encontra o ciclo já avançado
+        async with channel.lock:
+            action = await self._pulse_plan(target_action)
+        if action is not None:
+            channel.pulsed(self, action, self._actuated_at)
+        elif self._rf.current_action() == target_action and channel.actuated_at is not None:
+            # Sem pulsos: o motor já reagiu ao pulso de outro membro (instante dessa atuação, se recente)
+            self._actuated_at = channel.actuated_at
+
+    async def _pulse_plan(self, target_action: str) -> Optional[str]:
+        """Pulsos até 'target_action'. Devolve a ação do último pulso enviado (None se nenhum)."""
+        moving = self._moving_direction is not None
+        if target_action == NEXT_STOP and not moving:
+            return None  # STOP só em movimento
+        direction = {NEXT_OPEN: DIR_UP, NEXT_CLOSE: DIR_DOWN}.get(target_action)
+        if direction is not None and self._reversal_too_soon(direction):
+            return None  # inversão ignorada (o evento sai de _move_to_target)
+        steps = self._rf.plan(target_action)
+        # Inversão em movimento: o ciclo passa por STOP; a posição fixa-se aí e o motor pausa antes de inverter
+        reversing = moving and direction not in (None, self._moving_direction) and NEXT_STOP in steps[:-1]
+        if reversing:
+            await self._cancel_move_task()
+        if steps:
+            self._rf_rollback = self._rf.index  # repor se o sensor de potência mostrar que o motor não reagiu
+        delay = max(0.05, self._single_pulse_delay_ms / 1000.0)
+        sent = 0
+        for i, action in enumerate(steps):
+            if not await self._single_pulse():
+                break
+            self._rf.pulsed(1)
+            sent += 1
+            if reversing and action == NEXT_STOP and self._halted_at is None:
+                self._halt(self._actuated_at)
+            await asyncio.sleep(delay)
+            if self._halted_at is not None and i < len(steps) - 1:
+                await self._reversal_pause()
+            if not moving and i < len(steps) - 1:
+                self._drift_position(action, delay)
+        self._single_next_action = self._rf.next_action()
+        self._log_state(
+            "rf_plan",
+            {"target": target_action, "pulses": sent, "belief": self._rf.belief},
+        )
+        return self._rf.current_action() if sent else None
 
     async def _run_script(self, entity_id: Optional[str]) -> None:
         if self._single_control_enabled or not entity_id:
             return
         try:
-            await self.hass.services.async_call("script", "turn_on", {"entity_id": entity_id}, blocking=False)
+            await self._call_script(entity_id, coalesce=True)
         except Exception as exc:  # noqa: BLE001
             _LOGGER.warning("Falha ao executar script %s: %s", entity_id, exc)
 
@@ -373,6 +905,16 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
     # ------------------------------
     # Movimento (máquina de estados)
     # ------------------------------
+    def _spawn_motion(self, coro) -> None:
+        """Arranca o runner de movimento sob o supervisor da entry."""
+        task = self._supervisor.create_task(coro, name=f"{DOMAIN} motion {self.entity_id}")
+        self._moving_task = task
+        task.add_done_callback(self._motion_task_done)
+
+    def _motion_task_done(self, task: asyncio.Task) -> None:
+        if self._moving_task is task:
+            self._moving_task = None
+
     async def _cancel_move_task(self) -> None:
         if self._moving_task:
             self._moving_task.cancel()
@@ -382,37 +924,111 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
                 pass
             self._moving_task = None
 
-    def _begin_motion(self, direction: str) -> None:
+    def _reversal_too_soon(self, direction: str) -> bool:
+        """Pedido no sentido inverso antes de reversal_guard_ms desde o arranque (toque duplo, automações em conflito)."""
+        return (
+            self._reversal_guard_s > 0
+            and self._moving_direction not in (None, direction)
+            and self._motion_started_at is not None
+            and time.monotonic() - self._motion_started_at < self._reversal_guard_s
+        )
+
+    def _halt(self, at: Optional[float]) -> None:
+        """Stop de uma inversão: fixa a posição fracionária no instante em que o motor pára."""
+        at = time.monotonic() if at is None else at
+        if self._calc is not None:
+            self._calc.stop(at=at)
+            self._position = int(round(self._calc.current_position()))
+        self._halted_at = at
+
+    async def _reversal_pause(self) -> None:
+        """Espera o tempo morto do motor (desde a paragem) antes de arrancar no sentido inverso."""
+        halted, self._halted_at = self._halted_at, None
+        if halted is not None and (wait := halted + self._reversal_dead_s - time.monotonic()) > 0:
+            await asyncio.sleep(wait)
+
+    def _begin_motion(self, direction: str, target: int, source: str = SOURCE_COMMAND) -> None:
         """Marca início de movimento: direção, assumed_state, next_action=STOP e publica estado coerente."""
         self._moving_direction = direction
         self._attr_assumed_state = False
-        self._single_next_action = NEXT_STOP
+        self._single_next_action = self._rf.next_action() if self._single_control_enabled else NEXT_STOP
+        self._motion_from = self._position
+        self._motion_target = target
+        self._motion_source = source
+        self._motion_started_at = time.monotonic()
         self._publish_state()
-        self._log_state("begin_motion", {"direction": direction})
+        self._fire_event(
+            EVENT_MOTION_STARTED,
+            from_position=self._position,
+            to_position=target,
+            duration=round(self._calc.travel_duration(self._position, target), 2) if self._calc else None,
+            source=source,
+        )
+        self._log_state("begin_motion", {"direction": direction, "source": source})
 
     def _finish_motion(self) -> None:
         """Marca fim de movimento: limpa direção, ajusta próxima ação conforme posição e publica."""
+        direction = self._moving_direction
         self._moving_direction = None
         self._attr_assumed_state = True
+        self._segment_anchored = False
+        self._disarm_power_watchdog()
+        self._motion_finished_at = time.monotonic()
+        # Fim de curso estimado: o motor pára sozinho (o ciclo avança como num pulso de stop)
+        # (num canal RF só quando o último membro em movimento chega: o passo é partilhado)
+        channel_busy = self._rf_channel is not None and self._rf_channel.others_moving(self)
+        if (direction, self._position) in ((DIR_UP, 100), (DIR_DOWN, 0)) and not channel_busy:
+            self._rf.settle_at_end(NEXT_OPEN if direction == DIR_UP else NEXT_CLOSE)
+            if self._rf_channel is not None:
+                self._rf_channel.refresh(self)
         # Próxima ação pós-paragem
-        self._single_next_action = NEXT_OPEN if self._position == 0 else NEXT_CLOSE if self._position == 100 else NEXT_STOP
+        self._single_next_action = self._expected_next_action()
         self._publish_state()
+        if self._motion_started_at is not None:
+            self._fire_event(
+                EVENT_MOTION_FINISHED,
+                from_position=self._motion_from,
+                to_position=self._position,
+                target_position=self._motion_target,
+                duration=round(time.monotonic() - self._motion_started_at, 2),
+                source=self._motion_source,
+            )
+            self._motion_started_at = None
+        self._notify_live()
         self._log_state("finish_motion")
 
-    async def _move_to_target(self, target: int, *, drive_scripts: bool) -> None:
+    async def _move_to_target(self, target: int, *, drive_scripts: bool, source: str = SOURCE_COMMAND) -> None:
         """Motor de movimento. Assume _op_lock adquirido por caller."""
-        # 1) short-circuits
+        # 1) inversões e short-circuits
+        was_moving = self._moving_direction is not None
+        calc = self._calc
+        current = calc.current_position() if calc is not None and was_moving else float(self._position)
+        heading = DIR_UP if target > current else DIR_DOWN if target < current else None
+        if heading is not None and self._reversal_too_soon(heading):
+            self._command_dropped("reverse", "reversal_too_soon", source)
+            return
+        reversing = was_moving and heading not in (None, self._moving_direction)
         await self._cancel_move_task()
+        if reversing and drive_scripts:
+            # stop → tempo morto → sentido inverso; a posição fica no instante real da paragem
+            await self._start_action(NEXT_STOP)
+            self._halt(self._take_actuation_time())
+            await self._reversal_pause()
+        elif calc is not None and was_moving:
+            calc.stop()  # mesmo sentido: continua da posição fracionária, sem arredondar
         if target == self._position:
-            if target in (0, 100) and self._send_stop_at_ends:
+            if not was_moving and self.position_uncertainty < UNCERTAINTY_SKIP_STOP:
+                pass  # parada no alvo com incerteza pequena: o stop seria redundante
+            elif target in (0, 100) and self._send_stop_at_ends:
                 await self._start_action(NEXT_STOP) if drive_scripts else None
             elif self._smart_stop_midrange and target not in (0, 100):
                 await self._start_action(NEXT_STOP) if drive_scripts else None
+            self._actuated_at = None
             return
 
         # 2) direção e arranque físico
         direction = DIR_UP if target > self._position else DIR_DOWN
-        self._begin_motion(direction)
+        self._begin_motion(direction, target, source)
 
         if drive_scripts:
             await self._start_action(NEXT_OPEN if direction == DIR_UP else NEXT_CLOSE)
@@ -422,43 +1038,54 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
         self._calc = calc
         calc.travel_time_down = self._travel_down
         calc.travel_time_up = self._travel_up
-        calc.set_position(float(self._position))
-        calc.start_travel(float(target))
+        # Extremo com incerteza grande (ou recalibração): o motor anda mais para garantir o fim de curso
+        overrun = self._end_overrun(target, force=source == SOURCE_RESYNC)
+        # Início ancorado no instante em que o motor reage (latência compensada); no mesmo sentido
+        # o motor nunca parou e a deslocação continua de imediato
+        started_at = self._take_actuation_time()
+        calc.start_travel(float(target), started_at=None if was_moving and not reversing else started_at)
+        self._travel_started()
 
         # 4) loop de movimento
         should_mid_stop = self._smart_stop_midrange and MID_RANGE_LOW <= target <= MID_RANGE_HIGH
+        pacer = self._pacer
 
         async def _runner() -> None:
             try:
                 while True:
-                    await asyncio.sleep(UPDATE_INTERVAL_SEC)
+                    # Paragem a meio: stop antecipado pela latência e pelo atraso do loop para parar no alvo
+                    lead = self._latency_s() + pacer.lag if should_mid_stop else 0.0
+                    # Prazo recalculado a cada tick (referências intermédias podem re-ancorar o cálculo);
+                    # sob carga publica-se menos vezes, mas a última espera vai sempre até ao prazo
+                    deadline = calc.travel_end_time() + overrun - lead
+                    remaining = deadline - calc.current_time()
+                    # No prolongamento a posição já não muda: dormir direto até ao prazo
+                    overrunning = calc.current_time() >= calc.travel_end_time()
+                    await pacer.sleep(max(0.0, remaining if overrunning else min(pacer.interval, remaining)))
+                    if calc.travel_direction is TravelStatus.STOPPED:
+                        break  # parado por fora (posição/âncora imposta): o prazo deixou de existir
+                    reached = calc.current_time() >= calc.travel_end_time() + overrun - lead
                     current = int(round(calc.current_position()))
                     self._position = min(current, target) if direction == DIR_UP else max(current, target)
-                    self._publish_state(recompute_features=False)
-
-                    # Fim de curso
-                    if self._position in (0, 100):
-                        if self._send_stop_at_ends:
-                            if drive_scripts:
-                                await self._start_action(NEXT_STOP)
-                            elif self._single_control_enabled and (self.is_opening or self.is_closing):
-                                await self._ensure_action_single(NEXT_STOP)
-                        calc.stop()
-                        break
+                    if not reached:
+                        self._publish_state(recompute_features=False)
+                        continue
 
-                    # Paragem a meio (smart stop)
-                    if should_mid_stop and self._position == target:
+                    # Fim de curso / paragem a meio (smart stop)
+                    if (target in (0, 100) and self._send_stop_at_ends) or should_mid_stop:
                         if drive_scripts:
                             await self._start_action(NEXT_STOP)
                         elif self._single_control_enabled and (self.is_opening or self.is_closing):
                             await self._ensure_action_single(NEXT_STOP)
-                        calc.stop()
-                        break
-
-                    # Alvo sem smart stop
-                    if self._position == target:
-                        calc.stop()
-                        break
+                    stopped_at = self._take_actuation_time()
+                    if target in (0, 100) and (overrun or not self._send_stop_at_ends):
+                        # Motor até ao fim de curso (sem stop no extremo, ou prolongado pela incerteza): âncora
+                        calc.anchor(float(target))
+                        self._last_confident_state = True
+                    else:
+                        # Alvo atingido: travão virtual no instante em que o motor pára
+                        calc.stop(at=stopped_at)
+                    break
             except asyncio.CancelledError:
                 pass
             finally:
@@ -466,26 +1093,150 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
                 self._position = int(round(calc.current_position()))
                 self._finish_motion()
 
-        self._moving_task = asyncio.create_task(_runner())
+        self._spawn_motion(_runner())
+
+    # ------------------------------
+    # Trajetória multi-waypoint (move_sequence)
+    # ------------------------------
+    @staticmethod
+    def _parse_sequence(positions: Any, default_dwell: Any = 0) -> list[tuple[int, float]]:
+        """Normaliza waypoints (número ou {position, dwell}) em [(posição, pausa_s)]."""
+        if isinstance(positions, (int, float, str, dict)):
+            positions = [positions]
+        if not isinstance(positions, (list, tuple)):
+            return []
+        try:
+            base_dwell = max(0.0, float(default_dwell or 0))
+        except (TypeError, ValueError):
+            base_dwell = 0.0
+        legs: list[tuple[int, float]] = []
+        for item in positions:
+            try:
+                if isinstance(item, dict):
+                    pos = item.get(ATTR_POSITION)
+                    dwell = max(0.0, float(item.get("dwell", base_dwell) or 0))
+                else:
+                    pos, dwell = item, base_dwell
+                legs.append((max(0, min(100, int(round(float(pos))))), dwell))
+            except (TypeError, ValueError):
+                return []
+        return legs
+
+    def _plan_sequence(self, legs: list[tuple[int, float]]) -> list[tuple[float, float, int]]:
+        """Calcula antecipadamente (início, fim, alvo) de cada troço em tempo monotónico.
+
+        Entre troços de sentidos opostos o motor pára e só arranca após o tempo morto (inversão).
+        """
+        calc = self._calc
+        t = calc.current_time()
+        pos = self._position
+        plan: list[tuple[float, float, int]] = []
+        prev_direction: Optional[str] = None
+        prev_end = t
+        for target, dwell in legs:
+            if target != pos:
+                direction = DIR_UP if target > pos else DIR_DOWN
+                if prev_direction not in (None, direction):
+                    t = max(t, prev_end + self._reversal_dead_s)
+                duration = calc.travel_duration(pos, target)
+                plan.append((t, t + duration, target))
+                t += duration
+                pos = target
+                prev_direction, prev_end = direction, t
+            t += dwell
+        return plan
+
+    async def _sequence_runner(self, plan: list[tuple[float, float, int]]) -> None:
+        """Executa o plano numa única task: arranque, ticks de posição e paragem em cada troço."""
+        calc = self._calc
+        prev_direction: Optional[str] = None
+        try:
+            for leg_start, _leg_end, target in plan:
+                if (wait := leg_start - calc.current_time()) > 0:
+                    await asyncio.sleep(wait)
+                direction = DIR_UP if target > self._position else DIR_DOWN
+                if prev_direction not in (None, direction):
+                    # Inversão: tempo morto contado da paragem real (o stop pode ter saído depois do previsto)
+                    await self._reversal_pause()
+                prev_direction = direction
+                self._halted_at = None
+                await self._start_action(NEXT_OPEN if direction == DIR_UP else NEXT_CLOSE)
+                self._begin_motion(direction, target, SOURCE_SERVICE)
+                # Troço ancorado no arranque real: depois da pausa de inversão, nunca antes do previsto
+                started_at = self._take_actuation_time() or max(leg_start, calc.current_time())
+                calc.start_travel(float(target), started_at=started_at)
+                self._travel_started()
+
+                # Paragem a meio enviada antecipada pela latência e pelo atraso do loop
+                mid_stop = target not in (0, 100)
+                pacer = self._pacer
+                while True:
+                    lead = self._latency_s() + pacer.lag if mid_stop else 0.0
+                    if (remaining := calc.travel_end_time() - lead - calc.current_time()) <= 0:
+                        break
+                    await pacer.sleep(min(pacer.interval, remaining))
+                    self._position = int(round(calc.current_position()))
+                    self._publish_state(recompute_features=False)
+
+                if mid_stop or self._send_stop_at_ends:
+                    await self._start_action(NEXT_STOP)
+                self._halt(self._take_actuation_time())
+                self._finish_motion()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._moving_direction is not None:
+                calc.stop()
+                self._position = int(round(calc.current_position()))
+                self._finish_motion()
+
+    async def _dispatcher_move_sequence(
+        self,
+        target_entities: str | list[str] | None,
+        positions: Any,
+        dwell: Any = 0,
+    ) -> None:
+        if not self._matches_target_entities(target_entities):
+            return
+        legs = self._parse_sequence(positions, dwell)
+        if not legs:
+            self._command_dropped("move_sequence", "invalid_positions", SOURCE_SERVICE)
+            return
+        async with self._op_lock:
+            await self._cancel_move_task()
+            if self._calc is None:
+                self._calc = TravelCalculator(self._travel_down, self._travel_up)
+            self._calc.travel_time_down = self._travel_down
+            self._calc.travel_time_up = self._travel_up
+            self._calc.set_position(float(self._position))
+            plan = self._plan_sequence(legs)
+            if not plan:
+                self._command_dropped("move_sequence", "already_at_target", SOURCE_SERVICE)
+                return
+            self._log_state("move_sequence", {"legs": [p[2] for p in plan]})
+            self._spawn_motion(self._sequence_runner(plan))
 
     # ------------------------------
     # Comandos de alto nível (bloqueados por _op_lock)
     # ------------------------------
     async def async_open_cover(self, **kwargs: Any) -> None:
+        source = kwargs.get("source", SOURCE_COMMAND)
         async with self._op_lock:
-            if self._single_control_enabled:
+            if self._single_control_enabled and not self._rf_idle_at(100):
                 await self._start_action(NEXT_OPEN)
-            await self._move_to_target(100, drive_scripts=not self._single_control_enabled)
+            await self._move_to_target(100, drive_scripts=not self._single_control_enabled, source=source)
 
     async def async_close_cover(self, **kwargs: Any) -> None:
+        source = kwargs.get("source", SOURCE_COMMAND)
         async with self._op_lock:
-            if self._single_control_enabled:
+            if self._single_control_enabled and not self._rf_idle_at(0):
                 await self._start_action(NEXT_CLOSE)
-            await self._move_to_target(0, drive_scripts=not self._single_control_enabled)
+            await self._move_to_target(0, drive_scripts=not self._single_control_enabled, source=source)
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         target = kwargs.get(ATTR_POSITION)
         if target is None:
+            self._command_dropped("set_cover_position", "missing_position")
             return
         target = max(0, min(100, int(target)))
         async with self._op_lock:
@@ -495,6 +1246,7 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
                 elif target < self._position:
                     await self._start_action(NEXT_CLOSE)
                 else:
+                    self._command_dropped("set_cover_position", "already_at_target")
                     return
                 await self._move_to_target(target, drive_scripts=False)
             else:
@@ -502,14 +1254,18 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         async with self._op_lock:
-            if self._single_control_enabled:
-                await self._start_action(NEXT_STOP)
-            await self._cancel_move_task()
-            # travão virtual & publicar
-            if self._calc:
-                self._calc.stop()
-                self._position = int(round(self._calc.current_position()))
-            self._finish_motion()
+            await self._stop_motion()
+
+    async def _stop_motion(self) -> None:
+        """Paragem (pulso em RF) + travão virtual. Assume _op_lock adquirido por caller."""
+        if self._single_control_enabled:
+            await self._start_action(NEXT_STOP)
+        await self._cancel_move_task()
+        # travão virtual & publicar
+        if self._calc:
+            self._calc.stop(at=self._take_actuation_time())
+            self._position = int(round(self._calc.current_position()))
+        self._finish_motion()
 
     # ------------------------------
     # Atributos extra
@@ -527,6 +1283,17 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
             "single_control_rf_script_entity_id": self._single_control_script_id,
             "single_control_pulse_delay_ms": self._single_pulse_delay_ms,
             "single_control_next_action": self._single_next_action,
+            "single_control_cycle": str(self._rf.cycle),
+            "single_control_cycle_index": self._rf.index,
+            "single_control_channel": self._rf_channel.name if self._rf_channel else None,
+            "single_control_ambiguous": self._rf.ambiguous,
+            "actuation_latency_ms": int(round(self._latency_s() * 1000)),
+            "measure_actuation_latency": self._measure_latency,
+            "reversal_dead_time_ms": int(round(self._reversal_dead_s * 1000)),
+            "reversal_guard_ms": int(round(self._reversal_guard_s * 1000)),
+            "background_tasks": self._supervisor.live,
+            "update_interval": self._pacer.interval,
+            "loop_lag_ms": int(round(self._pacer.lag * 1000)),
         }
         if hasattr(self, "_open_script_id") and self._open_script_id:
             attrs["open_script_entity_id"] = self._open_script_id
@@ -538,8 +1305,21 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
             attrs["close_contact_sensor_entity_id"] = self._close_contact_sensor_id
         if self._open_contact_sensor_id:
             attrs["open_contact_sensor_entity_id"] = self._open_contact_sensor_id
+        if self._reference_sensors:
+            attrs["reference_sensors"] = dict(self._reference_sensors)
+        if self._power_sensor_id:
+            attrs["power_sensor_entity_id"] = self._power_sensor_id
+            attrs["motor_running"] = self._power_on
+        if DIR_UP in self._learned_travel:
+            attrs["learned_travelling_time_up"] = round(self._learned_travel[DIR_UP], 2)
+        if DIR_DOWN in self._learned_travel:
+            attrs["learned_travelling_time_down"] = round(self._learned_travel[DIR_DOWN], 2)
         if self._last_confident_state is not None:
             attrs["position_confident"] = self._last_confident_state
+        attrs["position_uncertainty"] = round(self.position_uncertainty, 1)
+        if self._resync_window is not None:
+            attrs["resync_window"] = "-".join(t.strftime("%H:%M") for t in self._resync_window)
+            attrs["resync_error_budget"] = self._resync_budget
         return attrs
 
     # ------------------------------
@@ -555,11 +1335,13 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
         if not self._matches_target_entities(target_entities):
             return
         if position is None:
+            self._command_dropped("set_known_position", "missing_position", SOURCE_SERVICE)
             return
 
         try:
             pos_int = max(0, min(100, int(round(float(position)))))
         except (TypeError, ValueError):
+            self._command_dropped("set_known_position", "invalid_position", SOURCE_SERVICE)
             return
 
         self._last_confident_state = confident
@@ -568,32 +1350,38 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
 
         async with self._op_lock:
             if position_type == "current":
-                self._calc.set_position(float(pos_int))
+                # Posição imposta: o movimento em curso (simulado) termina aqui
+                await self._cancel_move_task()
+                self._calc.set_position(float(pos_int), uncertainty=0.0 if confident else UNCERTAINTY_MAX)
+                self._segment_anchored = confident
                 self._position = int(round(self._calc.current_position()))
-                await self._set_next_action(NEXT_OPEN if self._position == 0 else NEXT_CLOSE if self._position == 100 else NEXT_STOP)
+                self._rf_assume_rest(definite=confident)
+                await self._set_next_action(self._expected_next_action())
                 self._publish_state()
+                self._notify_live()
             else:
                 if self._single_control_enabled:
                     if pos_int > self._position:
                         await self._start_action(NEXT_OPEN)
                     elif pos_int < self._position:
                         await self._start_action(NEXT_CLOSE)
-                await self._move_to_target(pos_int, drive_scripts=not self._single_control_enabled)
+                await self._move_to_target(pos_int, drive_scripts=not self._single_control_enabled, source=SOURCE_SERVICE)
 
     async def _dispatcher_set_known_action(
         self,
         target_entities: str | list[str] | None,
         action: str | None,
     ) -> None:
-        if not self._matches_target_entities(target_entities) or not action:
+        if not self._matches_target_entities(target_entities):
             return
-        act = str(action).lower().strip()
+        act = str(action or "").lower().strip()
         if act not in (NEXT_OPEN, NEXT_CLOSE, NEXT_STOP):
+            self._command_dropped("set_known_action", "invalid_action", SOURCE_SERVICE)
             return
         if act == NEXT_OPEN:
-            await self.async_open_cover()
+            await self.async_open_cover(source=SOURCE_SERVICE)
         elif act == NEXT_CLOSE:
-            await self.async_close_cover()
+            await self.async_close_cover(source=SOURCE_SERVICE)
         else:
             await self.async_stop_cover()
 
@@ -609,28 +1397,28 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
                 # Usa a próxima ação — evitar pulso duplicado no STOP
                 if self._single_next_action == NEXT_OPEN:
                     await self._start_action(NEXT_OPEN)
-                    await self._move_to_target(100, drive_scripts=False)
+                    await self._move_to_target(100, drive_scripts=False, source=SOURCE_SERVICE)
                 elif self._single_next_action == NEXT_CLOSE:
                     await self._start_action(NEXT_CLOSE)
-                    await self._move_to_target(0, drive_scripts=False)
+                    await self._move_to_target(0, drive_scripts=False, source=SOURCE_SERVICE)
                 else:
-                    # Apenas parar (um pulso se estiver em movimento)
-                    await self.async_stop_cover()
+                    # Apenas parar (um pulso se estiver em movimento); _op_lock já adquirido
+                    await self._stop_motion()
                 return
 
             # Standard
-            if not action:
-                return
-            act = str(action).lower().strip()
+            act = str(action or "").lower().strip()
             if act == NEXT_OPEN:
                 await self._run_script(self._open_script_id)
-                await self._move_to_target(100, drive_scripts=False)
+                await self._move_to_target(100, drive_scripts=False, source=SOURCE_SERVICE)
             elif act == NEXT_CLOSE:
                 await self._run_script(self._close_script_id)
-                await self._move_to_target(0, drive_scripts=False)
+                await self._move_to_target(0, drive_scripts=False, source=SOURCE_SERVICE)
             elif act == NEXT_STOP:
                 await self._run_script(self._stop_script_id)
-                await self.async_stop_cover()
+                await self._stop_motion()
+            else:
+                self._command_dropped("activate_script", "invalid_action", SOURCE_SERVICE)
 
     # ------------------------------
     # Utilitário de filtro de alvos
@@ -647,20 +1435,89 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
     # ------------------------------
     # Sensores binários (INVERTIDOS)
     # ------------------------------
-    async def _apply_contact_hit(self, forced_position: int, *, source_entity: Optional[str] = None) -> None:
+    def _learn_travel_time(self, reached: float) -> None:
+        """Estima o tempo de viagem total a partir do troço desde o último ponto de referência."""
+        calc = self._calc
+        direction = self._moving_direction
+        if calc is None or direction is None or not self._segment_anchored:
+            return
+        distance = abs(reached - calc.start_position)
+        elapsed = calc.elapsed()
+        if distance < LEARN_MIN_DISTANCE or elapsed <= 0:
+            return
+        sample = elapsed * 100.0 / distance
+        prev = self._learned_travel.get(direction)
+        self._learned_travel[direction] = sample if prev is None else prev + LEARN_EWMA_ALPHA * (sample - prev)
+        _LOGGER.debug("%s: tempo de viagem (%s) observado %.2fs", self.entity_id, direction, sample)
+
+    async def _apply_reference_hit(self, position: int, *, source_entity: str) -> None:
+        """Sensor intermédio atravessado: re-ancora o TravelCalculator sem parar o movimento."""
+        if self._calc is None:
+            self._calc = TravelCalculator(self._travel_down, self._travel_up)
+        estimated = self._calc.current_position()
+        if self._moving_direction is not None:
+            self._learn_travel_time(position)
+        self._calc.rebase(float(position), uncertainty=REFERENCE_UNCERTAINTY)
+        self._position = int(round(self._calc.current_position()))
+        self._segment_anchored = True
+        self._last_confident_state = True
+        self._publish_state(recompute_features=self._moving_direction is None)
+        self._fire_event(
+            EVENT_CONTACT_CORRECTION,
+            from_position=round(estimated, 1),
+            to_position=position,
+            drift=round(position - estimated, 1),
+            source=SOURCE_CONTACT,
+            sensor_entity_id=source_entity,
+        )
+        self._notify_live()
+        self._log_state("reference_hit", {"source": source_entity})
+
+    async def _reference_state_changed(self, event) -> None:
+        new_state = event.data.get("new_state")
+        old_state = event.data.get("old_state")
+        if not new_state:
+            return
+        position = self._reference_sensors.get(new_state.entity_id)
+        if position is None:
+            return
+        # Mesma convenção dos sensores de contacto: "off" = íman presente
+        ns = str(new_state.state).lower()
+        os = str(old_state.state).lower() if old_state else None
+        if ns == "off" and os != "off":
+            await self._apply_reference_hit(position, source_entity=new_state.entity_id)
+
+    async def _apply_contact_hit(
+        self, forced_position: int, *, source_entity: Optional[str] = None, actuate: bool = True
+    ) -> None:
+        """Fim de curso observado por contacto. Assume _op_lock adquirido por caller."""
+        self._learn_travel_time(forced_position)
         await self._cancel_move_task()
         if self._calc is None:
             self._calc = TravelCalculator(self._travel_down, self._travel_up)
-        self._calc.set_position(float(forced_position))
+        estimated = self._calc.current_position()
+        self._calc.anchor(float(forced_position))
         self._position = forced_position
         self._attr_assumed_state = True
         self._last_confident_state = True
+        self._segment_anchored = True
 
-        if self._send_stop_at_ends and forced_position in (0, 100) and not self._single_control_enabled:
+        if actuate and self._send_stop_at_ends and forced_position in (0, 100) and not self._single_control_enabled:
             await self._start_action(NEXT_STOP)
 
-        await self._set_next_action(NEXT_OPEN if forced_position == 0 else NEXT_CLOSE)
+        # Fim de curso observado: resolve a ambiguidade do ciclo RF
+        self._rf.observe_end(NEXT_CLOSE if forced_position == 0 else NEXT_OPEN)
+        self._single_next_action = self._expected_next_action()
         self._publish_state()
+        self._fire_event(
+            EVENT_CONTACT_CORRECTION,
+            from_position=round(estimated, 1),
+            to_position=forced_position,
+            drift=round(forced_position - estimated, 1),
+            source=SOURCE_CONTACT,
+            sensor_entity_id=source_entity,
+        )
+        self._notify_live()
         self._log_state("contact_hit", {"source": source_entity})
 
     async def _closed_contact_state_changed(self, event) -> None:
@@ -671,12 +1528,18 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
         ns = str(new_state.state).lower()
         os = str(old_state.state).lower() if old_state else None
 
-        if ns == "off":
-            await self._apply_contact_hit(0, source_entity=self._close_contact_sensor_id)
-            return
-        if ns == "on" and os == "off":
-            if not self._moving_task:
-                await self._move_to_target(100, drive_scripts=False)
+        # Serializado com os comandos (não interromper um comando a meio do arranque)
+        async with self._op_lock:
+            if ns == "off":
+                # Primeira leitura (sensor a ficar disponível) é só uma leitura: corrige sem atuar
+                await self._apply_contact_hit(
+                    0, source_entity=self._close_contact_sensor_id, actuate=os not in _NO_READING
+                )
+                return
+            if ns == "on" and os == "off":
+                self._rf.observe(NEXT_OPEN)
+                if not self._moving_task:
+                    await self._move_to_target(100, drive_scripts=False, source=SOURCE_CONTACT)
 
     async def _open_contact_state_changed(self, event) -> None:
         new_state = event.data.get("new_state")
@@ -686,9 +1549,224 @@ class TimeBasedSyncCover(CoverEntity, RestoreEntity):
         ns = str(new_state.state).lower()
         os = str(old_state.state).lower() if old_state else None
 
-        if ns == "off":
-            await self._apply_contact_hit(100, source_entity=self._open_contact_sensor_id)
+        async with self._op_lock:
+            if ns == "off":
+                await self._apply_contact_hit(
+                    100, source_entity=self._open_contact_sensor_id, actuate=os not in _NO_READING
+                )
+                return
+            if ns == "on" and os == "off":
+                self._rf.observe(NEXT_CLOSE)
+                if not self._moving_task:
+                    await self._move_to_target(0, drive_scripts=False, source=SOURCE_CONTACT)
+
+    # ------------------------------
+    # Sensor de potência (motor a andar)
+    # ------------------------------
+    def _power_reading(self, state: Any) -> Optional[bool]:
+        """True = motor a consumir (≥ limiar), False = parado, None = sem leitura."""
+        try:
+            return float(state.state) >= self._power_threshold
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def _travel_started(self) -> None:
+        """Troço arrancado no TravelCalculator: ancora no flanco de potência (se já visto) ou arma o watchdog."""
+        calc = self._calc
+        self._power_anchored = False
+        if self._power_sensor_id and calc is not None:
+            rise = self._power_rise_at
+            fresh = rise is not None and rise > (self._motion_finished_at or float("-inf"))
+            if self._power_on and fresh and rise >= calc.travel_started_time - POWER_ANCHOR_WINDOW_SEC:
+                calc.anchor_start(rise)
+                self._power_anchored = True
+            elif self._power_on is False:
+                self._disarm_power_watchdog()
+                self._cancel_power_watchdog = async_call_later(
+                    self.hass, POWER_START_TIMEOUT_SEC + self._latency_s(), self._power_watchdog_expired
+                )
+            self._power_segment = calc.segment()
+        self._notify_live()
+
+    def _disarm_power_watchdog(self) -> None:
+        if self._cancel_power_watchdog is not None:
+            self._cancel_power_watchdog()
+            self._cancel_power_watchdog = None
+
+    @callback
+    def _power_watchdog_expired(self, _now: Any) -> None:
+        self._cancel_power_watchdog = None
+        if self._moving_direction is not None and not self._power_on:
+            # Supervisionada: cancelada no unload/remoção (nada a correr numa entidade removida)
+            self._supervisor.create_task(self._async_watchdog_expired(), name=f"{DOMAIN} watchdog {self.entity_id}")
+
+    async def _async_watchdog_expired(self) -> None:
+        async with self._op_lock:
+            await self._actuation_failed()
+
+    async def _actuation_failed(self) -> None:
+        """Comando enviado mas o motor não consumiu: a cover não se moveu (ex.: pulso RF perdido).
+
+        Assume _op_lock adquirido por caller.
+        """
+        if self._moving_direction is None or self._power_on:
+            return
+        start = self._motion_from if self._motion_from is not None else self._position
+        self._fire_event(
+            EVENT_ACTUATION_FAILED,
+            direction=self._moving_direction,
+            from_position=start,
+            target_position=self._motion_target,
+            source=self._motion_source,
+            waited=round(POWER_START_TIMEOUT_SEC + self._latency_s(), 2),
+        )
+        _LOGGER.warning("%s: atuação sem consumo no motor (%s) — comando perdido?", self.entity_id, self._power_sensor_id)
+        if self._single_control_enabled and self._rf_rollback is not None:
+            # O ciclo não avançou (ou só em parte): hipótese principal volta ao passo anterior
+            self._rf.assume_rest(self._rf_rollback)
+        if self._calc:
+            self._calc.set_position(float(start))
+        self._power_segment = None
+        await self._cancel_move_task()
+        if self._moving_direction is not None:
+            self._position = int(start)
+            self._finish_motion()
+
+    async def _apply_power_stop(self, at: float) -> None:
+        """Flanco descendente em movimento: o motor parou antes do previsto. Assume _op_lock adquirido por caller."""
+        calc = self._calc
+        target = self._motion_target
+        if calc is None:
+            return
+        # Fim de curso só se o corte chega perto do fim estimado (dentro da banda de incerteza);
+        # antes disso foi uma paragem externa: trava no instante do flanco, sem aprender tempos
+        at_end = target in (0, 100) and abs(target - calc.current_position(at)) <= calc.uncertainty(at) + OVERRUN_MARGIN
+        if at_end:
+            # O fim de curso cortou o motor — posição confirmada
+            self._learn_travel_time(float(target))
+            calc.anchor(float(target))
+            self._last_confident_state = True
+        else:
+            calc.stop(at=at)
+        self._power_segment = None
+        # O runner fixa a posição (já parada) e publica uma vez
+        await self._cancel_move_task()
+        if self._moving_direction is not None:
+            self._position = int(round(calc.current_position()))
+            self._finish_motion()
+        self._log_state("power_stop", {"target": target})
+
+    def _apply_late_stop(self, at: float) -> None:
+        """Flanco descendente pouco depois do fim estimado: o motor andou até 'at' — corrige a posição final."""
+        seg, self._power_segment = self._power_segment, None
+        if seg is None or self._calc is None:
+            return
+        pos = seg["start_position"] + seg["speed"] * max(0.0, at - seg["started_at"])
+        pos = max(0.0, min(100.0, pos))
+        if abs(pos - self._calc.current_position()) < 0.5:
+            return
+        self._calc.set_position(pos)
+        self._position = int(round(pos))
+        self._publish_state()
+        self._notify_live()
+        self._log_state("power_late_stop", {"position": round(pos, 1)})
+
+    async def _power_state_changed(self, event) -> None:
+        new_state = event.data.get("new_state")
+        now = time.monotonic()
+        running = self._power_reading(new_state)
+        was_running, self._power_on = self._power_on, running
+        if running is None or running == was_running:
+            return
+
+        if running:
+            self._power_rise_at = now
+            if self._moving_direction is not None and not self._power_anchored and self._calc is not None:
+                # Arranque real do motor: elimina a latência script/RF da estimativa
+                self._calc.anchor_start(now)
+                self._power_anchored = True
+                self._power_segment = self._calc.segment()
+                self._disarm_power_watchdog()
+                self._notify_live()
             return
-        if ns == "on" and os == "off":
-            if not self._moving_task:
-                await self._move_to_target(0, drive_scripts=False)
+
+        if was_running is None:
+            return  # primeira leitura: não é um flanco
+        if self._moving_direction is not None:
+            async with self._op_lock:
+                if self._moving_direction is not None:
+                    await self._apply_power_stop(now)
+        elif self._motion_finished_at is not None and now - self._motion_finished_at <= POWER_LATE_STOP_SEC:
+            self._apply_late_stop(now)
+
+    # ------------------------------
+    # Incerteza da posição & resync em períodos calmos
+    # ------------------------------
+    @property
+    def position_uncertainty(self) -> float:
+        """Incerteza da posição (± %) segundo o TravelCalculator."""
+        return self._calc.uncertainty() if self._calc is not None else UNCERTAINTY_MAX
+
+    def _end_overrun(self, target: int, *, force: bool = False) -> float:
+        """Segundos extra de motor num movimento para um extremo, para cobrir a incerteza à chegada.
+
+        Com 'force' (recalibração) prolonga sempre: o fim de curso tem de ser atingido e ancorado.
+        """
+        calc = self._calc
+        if calc is None or target not in (0, 100):
+            return 0.0
+        band = calc.uncertainty() + abs(target - calc.current_position()) * DRIFT_PER_TRAVEL
+        if band < UNCERTAINTY_OVERRUN and not force:
+            return 0.0
+        extra = min(100.0, band + OVERRUN_MARGIN)
+        return calc.travel_duration(0.0, extra) if target == 100 else calc.travel_duration(extra, 0.0)
+
+    def resync_due(self, now: Any) -> bool:
+        """Configurada, dentro da janela calma, parada há algum tempo e acima do orçamento de incerteza."""
+        if self._resync_window is None or self._resync_budget <= 0 or not self._added_to_hass:
+            return False
+        if self._moving_direction is not None or self._op_lock.locked():
+            return False
+        if self._motion_finished_at is not None and time.monotonic() - self._motion_finished_at < RESYNC_IDLE_SEC:
+            return False
+        return self.position_uncertainty >= self._resync_budget and in_window(self._resync_window, now)
+
+    async def _drive_to(self, target: int, source: str) -> Optional[asyncio.Task]:
+        """Movimento pelo caminho de set_cover_position (pulsos RF ou scripts). Assume _op_lock adquirido."""
+        if self._single_control_enabled:
+            await self._start_action(NEXT_OPEN if target > self._position else NEXT_CLOSE)
+            await self._move_to_target(target, drive_scripts=False, source=source)
+        else:
+            await self._move_to_target(target, drive_scripts=True, source=source)
+        return self._moving_task
+
+    async def async_resync(self) -> bool:
+        """Recalibração: fim de curso mais próximo (prolongado pela incerteza → âncora) e regresso à posição anterior.
+
+        Devolve False se interrompida ou se o extremo não ficou ancorado.
+        """
+        async with self._op_lock:
+            if self._moving_direction is not None or self._calc is None:
+                return False
+            restore = self._position
+            end = 0 if restore <= 50 else 100
+            anchored_before = self._calc.anchored_at
+            task = await self._drive_to(end, SOURCE_RESYNC)
+        if task is not None:
+            await asyncio.wait({task})  # sem propagar cancelamentos ao runner
+
+        async with self._op_lock:
+            if (
+                self._moving_direction is not None
+                or self._position != end
+                or self._motion_source != SOURCE_RESYNC
+                or self._calc is None
+                or self._calc.anchored_at <= anchored_before  # sem âncora no extremo: continua em dívida
+            ):
+                _LOGGER.debug("%s: resync interrompido", self.entity_id)
+                return False
+            self._log_state("resync", {"end": end, "restore": restore})
+            task = await self._drive_to(restore, SOURCE_RESYNC) if restore != end else None
+        if task is not None:
+            await asyncio.wait({task})
+        return True
@@ -0,0 +1,151 @@
+# custom_components/cover_time_based_sync/live.py
+"""
+Posições ao vivo por WebSocket, sem escrita na máquina de estados.
+
+- Comando 'cover_time_based_sync/subscribe_positions' {entity_ids, rate_hz (1–20)};
+- Em cada mudança de troço (arranque, paragem, referência, contacto, novos tempos) envia um
+  'segment' (posição inicial, alvo, velocidade %/s, início em epoch) — o cliente pode interpolar;
+- Enquanto alguma cover subscrita se move envia 'positions' à taxa pedida, calculadas do
+  TravelCalculator; parado, não envia nada;
+- Sem subscritores o custo para as covers é um lookup num dict (async_notify).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+WS_SUBSCRIBE_POSITIONS = f"{DOMAIN}/subscribe_positions"
+DATA_LIVE = f"{DOMAIN}_live"
+DEFAULT_RATE_HZ = 10.0
+MAX_RATE_HZ = 20.0
+
+
+def _epoch(monotonic_ts: float) -> float:
+    """Converte um instante monotónico para epoch (s) — os clientes não partilham o relógio monotónico."""
+    return time.time() - (time.monotonic() - monotonic_ts)
+
+
+def _segment_message(entity: Any) -> dict[str, Any]:
+    seg = entity.live_segment()
+    msg: dict[str, Any] = {
+        "type": "segment",
+        "entity_id": entity.entity_id,
+        "position": round(entity.live_position(), 2),
+        "moving": seg is not None,
+    }
+    if seg is not None:
+        msg.update(
+            start_position=round(seg["start_position"], 2),
+            target=round(seg["target"], 2),
+            speed=round(seg["speed"], 4),
+            started_at=round(_epoch(seg["started_at"]), 3),
+            duration=round(seg["duration"], 3),
+        )
+    return msg
+
+
+class _LiveSubscription:
+    """Uma subscrição websocket: segmentos em mudanças e posições periódicas durante movimento."""
+
+    def __init__(self, hass: HomeAssistant, connection: Any, msg_id: int, entity_ids: list[str], rate_hz: float) -> None:
+        self.hass = hass
+        self.connection = connection
+        self.msg_id = msg_id
+        self.entity_ids = entity_ids
+        self.interval = 1.0 / rate_hz
+        self._moving: dict[str, Any] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    def _send(self, payload: dict[str, Any]) -> None:
+        self.connection.send_message(websocket_api.event_message(self.msg_id, payload))
+
+    @callback
+    def update(self, entity: Any) -> None:
+        """Mudança de troço numa cover subscrita."""
+        msg = _segment_message(entity)
+        self._send(msg)
+        if msg["moving"]:
+            self._moving[entity.entity_id] = entity
+            if self._timer is None:
+                self._timer = self.hass.loop.call_later(self.interval, self._tick)
+        else:
+            self._moving.pop(entity.entity_id, None)
+
+    @callback
+    def _tick(self) -> None:
+        self._timer = None
+        for eid, entity in list(self._moving.items()):
+            if entity.live_segment() is None:
+                self._moving.pop(eid)
+        if not self._moving:
+            return
+        self._send({
+            "type": "positions",
+            "t": round(time.time(), 3),
+            "positions": {eid: round(ent.live_position(), 2) for eid, ent in self._moving.items()},
+        })
+        self._timer = self.hass.loop.call_later(self.interval, self._tick)
+
+    @callback
+    def cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        subs: dict[str, set[_LiveSubscription]] = self.hass.data.get(DATA_LIVE, {})
+        for eid in self.entity_ids:
+            if (bucket := subs.get(eid)) is not None:
+                bucket.discard(self)
+                if not bucket:
+                    subs.pop(eid)
+
+
+@callback
+def async_notify(hass: HomeAssistant, entity: Any) -> None:
+    """Chamado pelas covers em mudanças de troço/posição; só trabalha se houver subscritores."""
+    subs = hass.data.get(DATA_LIVE)
+    if not subs or (bucket := subs.get(entity.entity_id)) is None:
+        return
+    for sub in list(bucket):
+        sub.update(entity)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE_POSITIONS,
+        vol.Required("entity_ids"): vol.All([str], vol.Length(min=1)),
+        vol.Optional("rate_hz", default=DEFAULT_RATE_HZ): vol.All(vol.Coerce(float), vol.Range(min=1, max=MAX_RATE_HZ)),
+    }
+)
+@callback
+def ws_subscribe_positions(hass: HomeAssistant, connection: Any, msg: dict[str, Any]) -> None:
+    """Subscreve posições ao vivo de várias covers (snapshot imediato + segmentos + ticks)."""
+    component = hass.data.get("cover")
+    entities = []
+    for eid in dict.fromkeys(msg["entity_ids"]):
+        entity = component.get_entity(eid) if component is not None else None
+        if entity is None or not hasattr(entity, "live_segment"):
+            connection.send_error(msg["id"], "not_found", f"{eid} não é uma cover {DOMAIN}")
+            return
+        entities.append(entity)
+
+    sub = _LiveSubscription(hass, connection, msg["id"], [e.entity_id for e in entities], msg["rate_hz"])
+    subs: dict[str, set[_LiveSubscription]] = hass.data.setdefault(DATA_LIVE, {})
+    for entity in entities:
+        subs.setdefault(entity.entity_id, set()).add(sub)
+    connection.subscriptions[msg["id"]] = sub.cancel
+    connection.send_result(msg["id"])
+    for entity in entities:
+        sub.update(entity)
+
+
+@callback
+def async_register_websocket(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe_positions)
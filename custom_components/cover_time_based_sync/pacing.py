@@ -0,0 +1,78 @@
+# custom_components/cover_time_based_sync/pacing.py
+"""
+Ritmo dos runners de movimento em função do atraso do event loop.
+
+- Cada espera de um runner mede o atraso (acordar real − acordar agendado), suavizado (EWMA
+  rápido a subir, lento a descer) e partilhado por todas as covers (o loop é um só);
+- Com o loop folgado publica-se a BASE_INTERVAL_SEC; sob carga o intervalo de publicação
+  cresce com o atraso em múltiplos de BASE_INTERVAL_SEC (até MAX_INTERVAL_SEC) — menos escritas
+  de estado, menos carga; o atraso em si só vai para o log (debug) quando o intervalo muda;
+- Os prazos de paragem não dependem do intervalo: as posições vêm do tempo absoluto e a
+  última espera vai sempre até ao prazo (antecipada pelo atraso medido nas paragens a meio).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PACER = f"{DOMAIN}_pacer"
+BASE_INTERVAL_SEC = 0.5
+MAX_INTERVAL_SEC = 5.0
+LAG_QUIET_SEC = 0.05  # atraso tolerado sem abrandar
+LAG_STEP_SEC = 0.05  # cada passo de atraso acima do tolerado soma um intervalo base
+LAG_ALPHA_RISE = 0.5  # carga nova: abrandar depressa
+LAG_ALPHA_FALL = 0.1  # carga a passar: recuperar devagar (sem oscilar)
+LAG_STALE_SEC = 60.0  # sem amostras há mais do que isto: atraso desconhecido → 0
+
+
+class LoopPacer:
+    """Atraso medido do event loop e intervalo de publicação efetivo."""
+
+    def __init__(self) -> None:
+        self._lag = 0.0
+        self._sampled_at: float | None = None
+
+    def sample(self, lag: float) -> None:
+        lag = max(0.0, lag)
+        before = self.interval
+        if self._sampled_at is None:
+            self._lag = lag
+        else:
+            alpha = LAG_ALPHA_RISE if lag > self._lag else LAG_ALPHA_FALL
+            self._lag += alpha * (lag - self._lag)
+        self._sampled_at = time.monotonic()
+        if (after := self.interval) != before:
+            _LOGGER.debug("Atraso do event loop %.0f ms: intervalo de publicação %.1f s", self._lag * 1000, after)
+
+    @property
+    def lag(self) -> float:
+        """Atraso suavizado (s); 0 se não há amostras recentes."""
+        if self._sampled_at is None or time.monotonic() - self._sampled_at > LAG_STALE_SEC:
+            return 0.0
+        return self._lag
+
+    @property
+    def interval(self) -> float:
+        """Intervalo de publicação (s) para o atraso atual, em passos de BASE_INTERVAL_SEC."""
+        excess = self.lag - LAG_QUIET_SEC
+        if excess <= 0:
+            return BASE_INTERVAL_SEC
+        return min(MAX_INTERVAL_SEC, BASE_INTERVAL_SEC * (1 + math.ceil(excess / LAG_STEP_SEC)))
+
+    async def sleep(self, delay: float) -> None:
+        """asyncio.sleep que regista o atraso do acordar."""
+        due = time.monotonic() + delay
+        await asyncio.sleep(delay)
+        self.sample(time.monotonic() - due)
+
+
+def get_pacer(hass: HomeAssistant) -> LoopPacer:
+    return hass.data.setdefault(DATA_PACER, LoopPacer())
@@ -0,0 +1,231 @@
+# custom_components/cover_time_based_sync/profiler.py
+"""
+Profiling a pedido (serviço 'profile') dos caminhos quentes da integração.
+
+- Desligado não custa nada: nenhum código de medição fica nos métodos — durante a janela de
+  profiling os métodos da classe são substituídos por wrappers e repostos no fim (as entidades
+  religam os handlers do dispatcher via SIGNAL_PROFILE_REBIND);
+- Modo 'timing': tempo acumulado (n.º chamadas, total, média, máx.) por método, e por passo dos
+  runners de movimento (cada retoma da coroutine entre dois awaits = um tick);
+- Modo 'cprofile': cProfile no thread do event loop durante a janela, relatório filtrado pela
+  integração;
+- O relatório é escrito (em executor) num ficheiro de texto na pasta de configuração.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+import cProfile
+import functools
+import io
+import logging
+import pstats
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+MODE_TIMING = "timing"
+MODE_CPROFILE = "cprofile"
+MODES = (MODE_TIMING, MODE_CPROFILE)
+
+# Métodos instrumentados no modo 'timing' (síncronos e assíncronos)
+HOT_METHODS = (
+    "_publish_state",
+    "_matches_target_entities",
+    "_dispatcher_set_known_position",
+    "_dispatcher_set_known_action",
+    "_dispatcher_activate_script",
+    "_dispatcher_move_sequence",
+)
+HOT_PROPERTIES = ("extra_state_attributes",)
+MOTION_TICK = "motion_tick"
+
+# Pedido às entidades para religarem os handlers do dispatcher (métodos trocados/repostos)
+SIGNAL_PROFILE_REBIND = f"{DOMAIN}_profile_rebind"
+
+
+class _Stat:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+class _TimedCoroutine(Coroutine):
+    """Proxy de coroutine que mede o tempo de execução de cada passo (send/throw), sem as esperas.
+
+    per_step=True regista cada passo (um tick do runner); senão regista a soma no fim (uma chamada).
+    """
+
+    def __init__(self, coro: Coroutine, stat: _Stat, per_step: bool = False) -> None:
+        self._coro = coro
+        self._stat = stat
+        self._per_step = per_step
+        self._elapsed = 0.0
+
+    def _step(self, func: Callable, *args: Any) -> Any:
+        start = time.perf_counter()
+        done = False
+        try:
+            return func(*args)
+        except BaseException:
+            done = True  # StopIteration (fim) ou exceção: a coroutine terminou
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if self._per_step:
+                self._stat.add(elapsed)
+            else:
+                self._elapsed += elapsed
+                if done:
+                    self._stat.add(self._elapsed)
+
+    def send(self, value: Any) -> Any:
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args: Any) -> Any:
+        return self._step(self._coro.throw, *args)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self):
+        # Delegação passo a passo (como 'yield from'), medindo cada passo
+        message: Any = None
+        error: BaseException | None = None
+        while True:
+            try:
+                signal = self.throw(error) if error is not None else self.send(message)
+            except StopIteration as stop:
+                return stop.value
+            message, error = None, None
+            try:
+                message = yield signal
+            except GeneratorExit:
+                self.close()
+                raise
+            except BaseException as exc:  # noqa: BLE001 — reencaminhada para a coroutine
+                error = exc
+
+
+class HotPathProfiler:
+    """Uma janela de profiling de cada vez sobre a classe da entidade."""
+
+    def __init__(self, hass: HomeAssistant, target: type) -> None:
+        self.hass = hass
+        self._target = target
+        self._stats: dict[str, _Stat] = {}
+        self._originals: dict[str, Any] = {}
+        self._profile: cProfile.Profile | None = None
+        self.active = False
+
+    # ---- Instrumentação (modo timing) ----
+    def _wrap(self, name: str, func: Callable) -> Callable:
+        stat = self._stats.setdefault(name, _Stat())
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def _async_timed(*args: Any, **kwargs: Any) -> Any:
+                return await _TimedCoroutine(func(*args, **kwargs), stat)
+            return _async_timed
+
+        @functools.wraps(func)
+        def _timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stat.add(time.perf_counter() - start)
+        return _timed
+
+    def _instrument(self) -> None:
+        cls = self._target
+        for name in HOT_METHODS:
+            self._originals[name] = cls.__dict__[name]
+            setattr(cls, name, self._wrap(name, cls.__dict__[name]))
+        for name in HOT_PROPERTIES:
+            prop = cls.__dict__[name]
+            self._originals[name] = prop
+            setattr(cls, name, property(self._wrap(name, prop.fget)))
+
+        # Runners de movimento: cada passo da coroutine conta como um tick
+        spawn = cls.__dict__["_spawn_motion"]
+        tick = self._stats.setdefault(MOTION_TICK, _Stat())
+        self._originals["_spawn_motion"] = spawn
+
+        @functools.wraps(spawn)
+        def _spawn_timed(entity: Any, coro: Coroutine) -> None:
+            spawn(entity, _TimedCoroutine(coro, tick, per_step=True))
+        cls._spawn_motion = _spawn_timed
+
+    def _restore(self) -> None:
+        for name, original in self._originals.items():
+            setattr(self._target, name, original)
+        self._originals.clear()
+
+    # ---- Janela ----
+    def start(self, mode: str) -> None:
+        if self.active:
+            raise RuntimeError("profiling já em curso")
+        self._stats = {}
+        if mode == MODE_CPROFILE:
+            profile = cProfile.Profile()
+            profile.enable()  # ValueError se outro profiler estiver ativo
+            self._profile = profile
+        else:
+            self._instrument()
+            async_dispatcher_send(self.hass, SIGNAL_PROFILE_REBIND)
+        self.active = True
+
+    def stop(self) -> str:
+        """Termina a janela, repõe os métodos originais e devolve o relatório."""
+        if self._profile is not None:
+            self._profile.disable()
+            report = self._cprofile_report(self._profile)
+            self._profile = None
+        else:
+            self._restore()
+            async_dispatcher_send(self.hass, SIGNAL_PROFILE_REBIND)
+            report = self._timing_report()
+        self.active = False
+        return report
+
+    async def async_run(self, duration: float, mode: str) -> str:
+        """Mede durante 'duration' segundos; repõe sempre o estado original (mesmo se cancelado)."""
+        self.start(mode)
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            report = self.stop()
+        return report
+
+    # ---- Relatórios ----
+    def _timing_report(self) -> str:
+        rows = sorted(self._stats.items(), key=lambda kv: kv[1].total, reverse=True)
+        grand = sum(s.total for _, s in rows) or 1.0
+        lines = [f"{'função':<34} {'chamadas':>9} {'total ms':>10} {'média µs':>10} {'máx µs':>10} {'%':>6}"]
+        for name, s in rows:
+            mean = s.total / s.count if s.count else 0.0
+            lines.append(
+                f"{name:<34} {s.count:>9} {s.total * 1e3:>10.2f} {mean * 1e6:>10.1f} {s.max * 1e6:>10.1f} {100 * s.total / grand:>6.1f}"
+            )
+        return "\n".join(lines)
+
+    def _cprofile_report(self, profile: cProfile.Profile) -> str:
+        out = io.StringIO()
+        stats = pstats.Stats(profile, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self._target.__module__.rpartition(".")[0], 40)
+        return out.getvalue()
@@ -0,0 +1,78 @@
+# custom_components/cover_time_based_sync/reconcile.py
+"""
+Reconciliação no arranque: cada cover corrige a posição em silêncio (sem scripts nem eventos
+por cover) e reporta aqui o resultado; no fim é emitido um único resumo com as covers que
+ainda precisam de resync.
+
+- Durante o arranque do HA o resumo sai com EVENT_HOMEASSISTANT_STARTED;
+- Depois do arranque (reload / entry nova) sai após um curto debounce.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, EVENT_RECONCILED
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RECONCILE = f"{DOMAIN}_reconcile"
+SUMMARY_DEBOUNCE_SEC = 2.0
+
+# Motivos para resync
+REASON_NO_STATE = "no_restored_state"
+REASON_INTERRUPTED = "interrupted_motion"
+REASON_CONTACT_CONFLICT = "contact_conflict"
+REASON_CONTACT_MISMATCH = "contact_mismatch"
+
+
+class _BootSummary:
+    """Acumula os resultados até ao resumo (um por arranque / rajada de setups)."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.results: dict[str, dict[str, Any]] = {}
+        self._scheduled = False
+
+    @callback
+    def add(self, entity_id: str, position: int, confident: bool, reason: str | None) -> None:
+        self.results[entity_id] = {"position": position, "confident": confident, "reason": reason}
+        if self._scheduled:
+            return
+        self._scheduled = True
+        if self.hass.state is CoreState.running:
+            async_call_later(self.hass, SUMMARY_DEBOUNCE_SEC, self._emit)
+        else:
+            self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, self._emit)
+
+    @callback
+    def _emit(self, _arg: Any = None) -> None:
+        results, self.results, self._scheduled = self.results, {}, False
+        resync = {eid: r["reason"] for eid, r in results.items() if r["reason"]}
+        self.hass.bus.async_fire(
+            EVENT_RECONCILED,
+            {
+                "total": len(results),
+                "confident": sum(1 for r in results.values() if r["confident"]),
+                "needs_resync": sorted(resync),
+                "reasons": resync,
+            },
+        )
+        if resync:
+            _LOGGER.warning(
+                "Reconciliação: %d de %d covers precisam de resync: %s",
+                len(resync), len(results), ", ".join(f"{eid} ({why})" for eid, why in sorted(resync.items())),
+            )
+        else:
+            _LOGGER.info("Reconciliação: %d covers reconciliadas sem pendentes", len(results))
+
+
+@callback
+def async_report(hass: HomeAssistant, entity_id: str, position: int, confident: bool, reason: str | None) -> None:
+    """Regista o resultado da reconciliação de uma cover (resumo agregado, emitido uma vez)."""
+    summary: _BootSummary = hass.data.setdefault(DATA_RECONCILE, _BootSummary(hass))
+    summary.add(entity_id, position, confident, reason)
@@ -0,0 +1,143 @@
+# custom_components/cover_time_based_sync/resync.py
+"""
+Resync em períodos calmos: recalibração por curso completo das covers cuja incerteza de
+posição passou o orçamento, sem automações noturnas de "abrir tudo".
+
+- A incerteza (± %) vem do TravelCalculator: cresce com o curso e o tempo desde a última
+  âncora (contacto, referência, fim de curso atingido, posição confirmada);
+- De RESYNC_CHECK_INTERVAL em RESYNC_CHECK_INTERVAL o planeador junta as covers devidas (dentro
+  da janela calma, paradas há algum tempo e acima do orçamento), a mais desviada primeiro;
+- O lote é espaçado: no máximo RESYNC_MAX_CONCURRENT covers em movimento e pelo menos
+  RESYNC_STAGGER_SEC entre arranques (transmissões RF não se sobrepõem);
+- No fim é emitido um resumo (EVENT_RESYNC_FINISHED) com as covers recalibradas e as falhadas.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, time as dtime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, EVENT_RESYNC_FINISHED
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RESYNC = f"{DOMAIN}_resync"
+RESYNC_CHECK_INTERVAL = timedelta(minutes=5)
+RESYNC_MAX_CONCURRENT = 2
+RESYNC_STAGGER_SEC = 5.0
+
+
+def parse_window(value: Any) -> tuple[dtime, dtime] | None:
+    """Janela calma "HH:MM-HH:MM" (pode passar a meia-noite). Vazia → None; inválida → ValueError."""
+    if not value or not str(value).strip():
+        return None
+    try:
+        start_s, end_s = (part.strip() for part in str(value).split("-"))
+        start, end = dtime.fromisoformat(start_s), dtime.fromisoformat(end_s)
+    except ValueError as exc:
+        raise ValueError(f"janela inválida: {value}") from exc
+    if start == end:
+        raise ValueError(f"janela vazia: {value}")
+    return start, end
+
+
+def in_window(window: tuple[dtime, dtime], now: datetime) -> bool:
+    start, end = window
+    t = now.time().replace(tzinfo=None)
+    return start <= t < end if start < end else t >= start or t < end
+
+
+class ResyncPlanner:
+    """Uma instância por HA: covers registadas, verificação periódica e lotes espaçados."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._covers: dict[str, Any] = {}
+        self._unsub_interval = None
+        self._batch: asyncio.Task | None = None
+
+    @callback
+    def register(self, entity: Any) -> None:
+        self._covers[entity.entity_id] = entity
+        if self._unsub_interval is None:
+            self._unsub_interval = async_track_time_interval(self.hass, self._check, RESYNC_CHECK_INTERVAL)
+
+    @callback
+    def unregister(self, entity: Any) -> None:
+        if self._covers.get(entity.entity_id) is entity:
+            self._covers.pop(entity.entity_id)
+        if self._covers or self._unsub_interval is None:
+            return
+        self._unsub_interval()
+        self._unsub_interval = None
+        if self._batch is not None and not self._batch.done():
+            self._batch.cancel()
+
+    @callback
+    def _check(self, _now: Any = None) -> None:
+        if self._batch is not None and not self._batch.done():
+            return  # um lote de cada vez
+        now = dt_util.now()
+        due = [ent for ent in self._covers.values() if ent.resync_due(now)]
+        if not due:
+            return
+        due.sort(key=lambda ent: ent.position_uncertainty, reverse=True)
+        _LOGGER.info("Resync: %d covers acima do orçamento de incerteza: %s", len(due), ", ".join(e.entity_id for e in due))
+        self._batch = self.hass.async_create_task(self._run_batch(due))
+
+    async def _run_batch(self, due: list[Any]) -> None:
+        slots = asyncio.Semaphore(RESYNC_MAX_CONCURRENT)
+        results: dict[str, bool] = {}
+        running: list[asyncio.Task] = []
+
+        async def _one(entity: Any) -> None:
+            try:
+                results[entity.entity_id] = await entity.async_resync()
+            except Exception as exc:  # noqa: BLE001 — uma cover não interrompe o lote
+                _LOGGER.warning("Resync de %s falhou: %s", entity.entity_id, exc)
+                results[entity.entity_id] = False
+            finally:
+                slots.release()
+
+        try:
+            for idx, entity in enumerate(due):
+                await slots.acquire()
+                if idx:
+                    await asyncio.sleep(RESYNC_STAGGER_SEC)
+                # A janela pode ter acabado ou a cover ter sido usada entretanto
+                if not entity.resync_due(dt_util.now()):
+                    slots.release()
+                    continue
+                running.append(asyncio.get_running_loop().create_task(_one(entity)))
+            if running:
+                await asyncio.gather(*running)
+        finally:
+            for task in running:
+                task.cancel()
+        if not results:
+            return
+        self.hass.bus.async_fire(
+            EVENT_RESYNC_FINISHED,
+            {
+                "resynced": sorted(eid for eid, ok in results.items() if ok),
+                "failed": sorted(eid for eid, ok in results.items() if not ok),
+            },
+        )
+
+
+@callback
+def async_register(hass: HomeAssistant, entity: Any) -> None:
+    """Regista a cover no planeador (criado no primeiro registo)."""
+    planner: ResyncPlanner = hass.data.setdefault(DATA_RESYNC, ResyncPlanner(hass))
+    planner.register(entity)
+
+
+@callback
+def async_unregister(hass: HomeAssistant, entity: Any) -> None:
+    if (planner := hass.data.get(DATA_RESYNC)) is not None:
+        planner.unregister(entity)
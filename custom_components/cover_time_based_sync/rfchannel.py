@@ -0,0 +1,96 @@
+# custom_components/cover_time_based_sync/rfchannel.py
+"""
+Canais RF partilhados: várias covers no mesmo código do comando (um pulso move todas).
+
+- Covers em Controlo Único com o mesmo `single_control_channel` formam um canal;
+- O canal tem um único CycleTracker (os motores recebem os mesmos pulsos, logo estão no mesmo
+  passo do ciclo) e um lock: comandos de grupo simultâneos enviam uma só sequência de pulsos —
+  quem chega depois encontra o ciclo já na ação pretendida e não pulsa;
+- Depois de cada sequência os restantes membros seguem o motor (arrancam/param a simulação no
+  instante da atuação), cada um com os seus tempos de viagem e posição.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .rfcycle import CycleTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RF_CHANNELS = f"{DOMAIN}_rf_channels"
+
+
+class RfChannel:
+    """Membros de um canal, crença partilhada do ciclo e a última atuação."""
+
+    __slots__ = ("name", "tracker", "lock", "members", "actuated_at")
+
+    def __init__(self, name: str, tracker: CycleTracker) -> None:
+        self.name = name
+        self.tracker = tracker
+        self.lock = asyncio.Lock()  # uma sequência de pulsos de cada vez
+        self.members: dict[str, Any] = {}
+        self.actuated_at: Optional[float] = None
+
+    def pulsed(self, origin: Any, action: str, at: Optional[float]) -> None:
+        """'origin' enviou pulsos até 'action': os motores dos restantes membros também reagiram."""
+        self.actuated_at = at
+        for entity in list(self.members.values()):
+            if entity is not origin:
+                entity.follow_channel(action, at)
+
+    def refresh(self, origin: Any) -> None:
+        """O passo do ciclo mudou sem pulsos (fim de curso de 'origin'): os restantes republicam."""
+        for entity in list(self.members.values()):
+            if entity is not origin:
+                entity.channel_state_changed()
+
+    def others_moving(self, origin: Any) -> bool:
+        return any(ent is not origin and (ent.is_opening or ent.is_closing) for ent in self.members.values())
+
+
+class RfChannels:
+    """Uma instância por HA: canais por nome."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._channels: dict[str, RfChannel] = {}
+
+    @callback
+    def join(self, name: str, entity: Any, tracker: CycleTracker) -> RfChannel | None:
+        """Junta a cover ao canal; o primeiro membro define o ciclo (e a crença inicial)."""
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = RfChannel(name, tracker)
+        elif channel.tracker.cycle.steps != tracker.cycle.steps:
+            _LOGGER.warning(
+                "%s: ciclo %s diferente do canal RF '%s' (%s); fica fora do canal",
+                entity.entity_id, tracker.cycle, name, channel.tracker.cycle,
+            )
+            return None
+        channel.members[entity.entity_id] = entity
+        return channel
+
+    @callback
+    def leave(self, channel: RfChannel, entity: Any) -> None:
+        if channel.members.get(entity.entity_id) is entity:
+            channel.members.pop(entity.entity_id)
+        if not channel.members and self._channels.get(channel.name) is channel:
+            self._channels.pop(channel.name)
+
+
+@callback
+def async_join(hass: HomeAssistant, name: str, entity: Any, tracker: CycleTracker) -> RfChannel | None:
+    channels: RfChannels = hass.data.setdefault(DATA_RF_CHANNELS, RfChannels(hass))
+    return channels.join(name, entity, tracker)
+
+
+@callback
+def async_leave(hass: HomeAssistant, channel: RfChannel, entity: Any) -> None:
+    if (channels := hass.data.get(DATA_RF_CHANNELS)) is not None:
+        channels.leave(channel, entity)
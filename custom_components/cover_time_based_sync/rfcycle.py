@@ -0,0 +1,147 @@
+# custom_components/cover_time_based_sync/rfcycle.py
+"""
+Modelo do ciclo do botão único (RF): cada pulso avança um passo num ciclo fixo do motor,
+p.ex. abrir → parar → fechar → parar (o mais comum).
+
+- ButtonCycle: o ciclo em si (configurável, texto "open,stop,close,stop");
+- CycleTracker: crença sobre o passo atual do motor. Normalmente é um só passo; fica
+  ambígua (várias hipóteses, a principal primeiro) quando o estado real é desconhecido,
+  p.ex. após um arranque a meio curso. Planeia o nº mínimo de pulsos até à ação pretendida
+  e colapsa as hipóteses com observações (sensores de contacto).
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+ACTION_OPEN = "open"
+ACTION_CLOSE = "close"
+ACTION_STOP = "stop"
+_ACTIONS = (ACTION_OPEN, ACTION_CLOSE, ACTION_STOP)
+
+DEFAULT_CYCLE = "open,stop,close,stop"
+
+_CYCLES: dict[tuple[str, ...], ButtonCycle] = {}
+
+
+class ButtonCycle:
+    """Sequência de ações que o motor percorre, um passo por pulso (índices módulo o tamanho)."""
+
+    __slots__ = ("steps",)
+
+    def __init__(self, steps: Sequence[str]) -> None:
+        steps = tuple(str(s).strip().lower() for s in steps if str(s).strip())
+        if any(s not in _ACTIONS for s in steps) or not all(a in steps for a in _ACTIONS):
+            raise ValueError(f"ciclo inválido: {','.join(steps) or '(vazio)'}")
+        self.steps = steps
+
+    @classmethod
+    def parse(cls, value: Any) -> ButtonCycle:
+        """Aceita lista ou texto separado por vírgulas/setas ("open,stop,close,stop")."""
+        if not value:
+            value = DEFAULT_CYCLE
+        if isinstance(value, str):
+            value = value.replace("→", ",").replace("->", ",").split(",")
+        cycle = cls(list(value))
+        # Imutável: covers com o mesmo ciclo partilham a instância
+        return _CYCLES.setdefault(cycle.steps, cycle)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __str__(self) -> str:
+        return ",".join(self.steps)
+
+    def action(self, index: int) -> str:
+        return self.steps[index % len(self.steps)]
+
+    def indices(self, action: str) -> tuple[int, ...]:
+        return tuple(i for i, s in enumerate(self.steps) if s == action)
+
+    def settle(self, index: int) -> int:
+        """Passo após o fim de curso: se o passo seguinte é 'stop', o fim de curso conta como esse pulso."""
+        nxt = (index + 1) % len(self.steps)
+        return nxt if self.action(index) != ACTION_STOP and self.steps[nxt] == ACTION_STOP else index
+
+
+class CycleTracker:
+    """Crença sobre o passo atual do ciclo e planeamento de pulsos."""
+
+    __slots__ = ("cycle", "_belief")
+
+    def __init__(self, cycle: ButtonCycle, index: int | None = None) -> None:
+        self.cycle = cycle
+        self._belief: tuple[int, ...] = (cycle.settle(cycle.indices(ACTION_CLOSE)[0]) if index is None else index % len(cycle),)
+
+    @property
+    def belief(self) -> tuple[int, ...]:
+        return self._belief
+
+    @property
+    def index(self) -> int:
+        """Hipótese principal."""
+        return self._belief[0]
+
+    @property
+    def ambiguous(self) -> bool:
+        return len(self._belief) > 1
+
+    def current_action(self) -> str:
+        return self.cycle.action(self.index)
+
+    def next_action(self) -> str:
+        """Ação que o próximo pulso produz (hipótese principal)."""
+        return self.cycle.action(self.index + 1)
+
+    def _set(self, indices: Iterable[int]) -> None:
+        n = len(self.cycle)
+        self._belief = tuple(dict.fromkeys(i % n for i in indices)) or self._belief
+
+    # ---- Planeamento ----
+    def plan(self, action: str) -> list[str]:
+        """Ações produzidas por cada pulso até 'action' (vazia se já lá está).
+
+        Escolhe o nº de pulsos que satisfaz mais hipóteses; em empate, o que satisfaz a
+        principal e, depois, o menor.
+        """
+        n = len(self.cycle)
+        best: tuple[int, int, int] | None = None
+        best_k = 0
+        for k in range(n):
+            hits = sum(1 for b in self._belief if self.cycle.action(b + k) == action)
+            if not hits:
+                continue
+            score = (hits, int(self.cycle.action(self.index + k) == action), -k)
+            if best is None or score > best:
+                best, best_k = score, k
+        return [self.cycle.action(self.index + i) for i in range(1, best_k + 1)]
+
+    def pulsed(self, count: int = 1) -> None:
+        self._set(b + count for b in self._belief)
+
+    # ---- Observações ----
+    def observe(self, action: str) -> None:
+        """Motor visto a executar 'action' (p.ex. contacto de fim de curso libertado)."""
+        matching = [b for b in self._belief if self.cycle.action(b) == action]
+        self._set(matching or self.cycle.indices(action))
+
+    def observe_end(self, action: str) -> None:
+        """Fim de curso confirmado por sensor após 'action': crença definitiva."""
+        matching = [b for b in self._belief if self.cycle.action(b) == action]
+        self._belief = (self.cycle.settle((matching or self.cycle.indices(action))[0]),)
+
+    def settle_at_end(self, action: str) -> None:
+        """Fim de curso estimado (sem sensor): só as hipóteses em 'action' avançam."""
+        self._set(self.cycle.settle(b) if self.cycle.action(b) == action else b for b in self._belief)
+
+    def assume_rest(self, primary: int | None = None) -> None:
+        """Motor parado em estado desconhecido: todas as paragens possíveis, 'primary' primeiro."""
+        stops = [self.cycle.settle(i) for i in range(len(self.cycle)) if self.cycle.action(i) != ACTION_STOP]
+        stops += list(self.cycle.indices(ACTION_STOP))
+        if primary is not None:
+            stops.insert(0, primary)
+        self._set(stops)
+
+    def assume(self, index: int) -> None:
+        """Crença definitiva (sem ambiguidade)."""
+        self._set((index,))
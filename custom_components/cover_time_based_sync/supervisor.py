@@ -0,0 +1,63 @@
+# custom_components/cover_time_based_sync/supervisor.py
+"""
+TaskSupervisor: dono das tasks de fundo de uma entry (runners de movimento, sequências, etc.).
+
+- Cada task criada fica registada até terminar (removida por done-callback);
+- No unload/remoção cancela e aguarda todas — nenhuma task sobrevive a um reload;
+- Contadores (vivas / criadas / canceladas) para diagnóstico e testes de soak.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TaskSupervisor:
+    """Cria, contabiliza e encerra as tasks de fundo de uma entry/entidade."""
+
+    __slots__ = ("name", "_tasks", "_closed", "created", "cancelled")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._tasks: set[asyncio.Task] = set()
+        self._closed = False
+        self.created = 0
+        self.cancelled = 0
+
+    @property
+    def live(self) -> int:
+        """Número de tasks ainda por terminar."""
+        return len(self._tasks)
+
+    def create_task(self, coro: Coroutine[Any, Any, Any], name: str | None = None) -> asyncio.Task:
+        """Agenda 'coro' sob supervisão. Depois de encerrado, recusa novas tasks."""
+        if self._closed:
+            coro.close()
+            raise RuntimeError(f"TaskSupervisor {self.name} já encerrado")
+        task = asyncio.get_running_loop().create_task(coro, name=name or self.name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self.created += 1
+        return task
+
+    async def async_cancel_all(self) -> None:
+        """Cancela e aguarda todas as tasks vivas (o supervisor continua utilizável)."""
+        tasks = [t for t in self._tasks if not t.done()]
+        for task in tasks:
+            task.cancel()
+        self.cancelled += len(tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def async_shutdown(self) -> None:
+        """Encerra definitivamente: cancela/aguarda tudo e recusa novas tasks."""
+        self._closed = True
+        await self.async_cancel_all()
+        _LOGGER.debug("%s encerrado: %s", self.name, self.stats())
+
+    def stats(self) -> dict[str, int]:
+        return {"live": self.live, "created": self.created, "cancelled": self.cancelled}
@@ -4,7 +4,9 @@ TravelCalculator: cálculo preditivo de posição (0–100) para cover baseada e
 
 - Baseado no conceito do XKNX (travelcalculator) e forks de covers time-based;
 - Usa time.monotonic() para robustez a ajustes de relógio;
-- Não tem side-effects no método current_position() — leitura pura do estado calculado.
+- Não tem side-effects no método current_position() — leitura pura do estado calculado;
+- Incerteza (± %): resíduo da última âncora + curso percorrido desde então + tempo decorrido;
+  volta ao resíduo em cada âncora (contacto, referência, fim de curso).
 """
 from __future__ import annotations
 
@@ -27,6 +29,12 @@ class TravelStatus(Enum):
     STOPPED = 3
 
 
+# Crescimento da incerteza sem âncora
+DRIFT_PER_TRAVEL = 0.02  # ± % por % de curso percorrido
+DRIFT_PER_HOUR = 0.25  # ± % por hora (comandos físicos não observados, folgas)
+UNCERTAINTY_MAX = 100.0
+
+
 def _clamp(val: float, low: float, high: float) -> float:
     return max(low, min(high, val))
 
@@ -38,6 +46,22 @@ class TravelCalculator:
     POSITION_CLOSED = 0.0
     POSITION_OPEN = 100.0
 
+    # Uma instância por cover: slots em vez de __dict__ (frotas grandes)
+    __slots__ = (
+        "position_type",
+        "last_known_position",
+        "travel_time_down",
+        "travel_time_up",
+        "travel_to_position",
+        "travel_started_time",
+        "travel_direction",
+        "start_position",
+        "time_set_from_outside",
+        "anchor_uncertainty",
+        "travelled",
+        "anchored_at",
+    )
+
     def __init__(self, travel_time_down: float, travel_time_up: float) -> None:
         """travel_time_* em segundos."""
         self.position_type: PositionType = PositionType.UNKNOWN
@@ -50,10 +74,23 @@ class TravelCalculator:
         self.start_position: float = float(self.POSITION_CLOSED)
         # Quando uma fonte externa define explicitamente a posição
         self.time_set_from_outside: Optional[float] = None
+        # Incerteza: resíduo na última âncora, curso acumulado desde então e instante da âncora
+        self.anchor_uncertainty: float = UNCERTAINTY_MAX
+        self.travelled: float = 0.0
+        self.anchored_at: float = self.current_time()
 
     # ---------- Controlo de estado ----------
-    def set_position(self, position: float) -> None:
-        """Define posição conhecida (confirma)."""
+    def set_position(self, position: float, uncertainty: Optional[float] = None) -> None:
+        """Define posição conhecida (confirma).
+
+        Sem 'uncertainty' a incerteza acumulada mantém-se (o curso em curso é contabilizado);
+        com 'uncertainty' recomeça nesse valor (âncora).
+        """
+        self._fold_travel()
+        if uncertainty is not None:
+            self.anchor_uncertainty = _clamp(float(uncertainty), 0.0, UNCERTAINTY_MAX)
+            self.travelled = 0.0
+            self.anchored_at = self.current_time()
         pos = _clamp(position, self.POSITION_CLOSED, self.POSITION_OPEN)
         self.last_known_position = pos
         self.start_position = pos
@@ -62,16 +99,62 @@ class TravelCalculator:
         self.position_type = PositionType.CONFIRMED
         self.time_set_from_outside = self.current_time()
 
-    def stop(self) -> None:
-        """Interrompe deslocação e fixa a posição corrente como última conhecida."""
-        self.last_known_position = self.current_position()
+    def stop(self, at: Optional[float] = None) -> None:
+        """Interrompe deslocação e fixa a posição (no instante 'at', por omissão agora) como última conhecida."""
+        self._fold_travel(at)
+        self.last_known_position = self.current_position(at)
         self.start_position = self.last_known_position
         self.travel_to_position = self.last_known_position
         self.position_type = PositionType.CALCULATED
         self.travel_direction = TravelStatus.STOPPED
 
-    def start_travel(self, travel_to_position: float) -> None:
-        """Inicia deslocação até 'travel_to_position' (0–100)."""
+    def set_travel_times(self, travel_time_down: float, travel_time_up: float) -> None:
+        """Altera os tempos de viagem; numa deslocação em curso re-ancora na posição atual (sem saltos).
+
+        Com o arranque ainda no futuro (latência compensada) nada andou: o início agendado mantém-se.
+        """
+        if self.travel_direction is not TravelStatus.STOPPED:
+            now = self.current_time()
+            if now > self.travel_started_time:
+                self._fold_travel(now)
+                self.start_position = self.current_position(now)
+            self.travel_started_time = max(now, self.travel_started_time)
+        self.travel_time_down = float(travel_time_down)
+        self.travel_time_up = float(travel_time_up)
+
+    def anchor_start(self, started_at: float) -> None:
+        """Re-ancora o início da deslocação em curso num instante observado (arranque real do motor)."""
+        if self.travel_direction is not TravelStatus.STOPPED:
+            self.travel_started_time = float(started_at)
+
+    def anchor(self, position: float, uncertainty: float = 0.0) -> None:
+        """Posição observada (contacto, fim de curso): a incerteza volta ao resíduo da âncora."""
+        self.set_position(position, uncertainty=uncertainty)
+
+    def rebase(self, position: float, uncertainty: float = 0.0) -> None:
+        """Corrige a posição a meio de uma deslocação sem a interromper (referência intermédia)."""
+        if self.travel_direction is TravelStatus.STOPPED:
+            self.set_position(position, uncertainty=uncertainty)
+            return
+        pos = _clamp(position, self.POSITION_CLOSED, self.POSITION_OPEN)
+        up = self.travel_direction is TravelStatus.DIRECTION_UP
+        # Referência já para lá do alvo: a deslocação termina aí
+        if (up and pos >= self.travel_to_position) or (not up and pos <= self.travel_to_position):
+            self.set_position(pos, uncertainty=uncertainty)
+            return
+        now = self.current_time()
+        self.start_position = pos
+        self.travel_started_time = now
+        self.position_type = PositionType.CONFIRMED
+        self.anchor_uncertainty = _clamp(float(uncertainty), 0.0, UNCERTAINTY_MAX)
+        self.travelled = 0.0
+        self.anchored_at = now
+
+    def start_travel(self, travel_to_position: float, started_at: Optional[float] = None) -> None:
+        """Inicia deslocação até 'travel_to_position' (0–100).
+
+        'started_at' permite ancorar o início num instante planeado (monotónico).
+        """
         # Normaliza antes de decidir direção
         target = _clamp(travel_to_position, self.POSITION_CLOSED, self.POSITION_OPEN)
         current = self.current_position()
@@ -81,22 +164,23 @@ class TravelCalculator:
             self.set_position(target)
             return
 
-        # Inicializa deslocação
+        # Inicializa deslocação (uma deslocação anterior ainda em curso conta para a incerteza)
+        self._fold_travel()
         self.start_position = current
         self.travel_to_position = target
-        self.travel_started_time = self.current_time()
+        self.travel_started_time = self.current_time() if started_at is None else float(started_at)
         self.position_type = PositionType.CALCULATED
         self.travel_direction = (
             TravelStatus.DIRECTION_UP if target > current else TravelStatus.DIRECTION_DOWN
         )
 
     # ---------- Cálculo de posição ----------
-    def current_position(self) -> float:
-        """Devolve posição atual estimada (0–100). Não tem side-effects."""
+    def current_position(self, at: Optional[float] = None) -> float:
+        """Devolve posição estimada (0–100) agora ou no instante 'at'. Não tem side-effects."""
         if self.travel_direction is TravelStatus.STOPPED:
             return _clamp(self.last_known_position, self.POSITION_CLOSED, self.POSITION_OPEN)
 
-        elapsed = self.elapsed()
+        elapsed = self.elapsed(at)
         start = self.start_position
         target = self.travel_to_position
 
@@ -118,14 +202,62 @@ class TravelCalculator:
             return float(target)
         return _clamp(pos, self.POSITION_CLOSED, self.POSITION_OPEN)
 
+    def travel_duration(self, start: float, target: float) -> float:
+        """Segundos necessários para ir de 'start' a 'target' com os tempos atuais."""
+        travel_time = self.travel_time_up if target > start else self.travel_time_down
+        return abs(target - start) / 100.0 * travel_time
+
+    # ---------- Incerteza ----------
+    def _fold_travel(self, at: Optional[float] = None) -> None:
+        """Soma ao curso acumulado o troço em curso (antes de o re-ancorar ou parar)."""
+        if self.travel_direction is not TravelStatus.STOPPED:
+            self.travelled += abs(self.current_position(at) - self.start_position)
+
+    def travel_since_anchor(self, at: Optional[float] = None) -> float:
+        """Curso (%) percorrido desde a última âncora, incluindo o troço em curso."""
+        if self.travel_direction is TravelStatus.STOPPED:
+            return self.travelled
+        return self.travelled + abs(self.current_position(at) - self.start_position)
+
+    def uncertainty(self, at: Optional[float] = None) -> float:
+        """Incerteza da posição (± %): resíduo da âncora + curso e tempo desde então."""
+        now = self.current_time() if at is None else at
+        hours = max(0.0, now - self.anchored_at) / 3600.0
+        band = self.anchor_uncertainty + self.travel_since_anchor(at) * DRIFT_PER_TRAVEL + hours * DRIFT_PER_HOUR
+        return min(UNCERTAINTY_MAX, band)
+
     # ---------- Utilitários ----------
     @staticmethod
     def current_time() -> float:
         """Tempo monotónico (segundos)."""
         return time.monotonic()
 
-    def elapsed(self) -> float:
+    def elapsed(self, at: Optional[float] = None) -> float:
         """Segundos decorridos desde o início da deslocação (ou 0)."""
         if self.travel_direction is TravelStatus.STOPPED:
             return 0.0
-        return max(0.0, self.current_time() - self.travel_started_time)
+        now = self.current_time() if at is None else at
+        return max(0.0, now - self.travel_started_time)
+
+    def segment(self) -> Optional[dict[str, float]]:
+        """Deslocação em curso como troço linear (para interpolação por clientes) ou None se parada.
+
+        'speed' em %/s com sinal; 'started_at' no mesmo relógio monotónico de current_time().
+        """
+        if self.travel_direction is TravelStatus.STOPPED:
+            return None
+        up = self.travel_direction is TravelStatus.DIRECTION_UP
+        travel_time = max(self.travel_time_up if up else self.travel_time_down, 0.000001)
+        return {
+            "start_position": self.start_position,
+            "target": self.travel_to_position,
+            "speed": (100.0 if up else -100.0) / travel_time,
+            "started_at": self.travel_started_time,
+            "duration": self.travel_duration(self.start_position, self.travel_to_position),
+        }
+
+    def travel_end_time(self) -> float:
+        """Instante monotónico em que a deslocação corrente atinge o alvo."""
+        if self.travel_direction is TravelStatus.STOPPED:
+            return self.current_time()
+        return self.travel_started_time + self.travel_duration(self.start_position, self.travel_to_position)
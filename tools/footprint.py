@@ -0,0 +1,135 @@
+"""
+Orçamento de memória por cover de Cover Time Based Sync (frotas grandes).
+
+Cria N covers (por omissão 1000 e 10000) como o Home Assistant as adiciona — entidade,
+subscrições de serviços e sensores, um movimento completo (TravelCalculator criado) — e mede
+com tracemalloc os bytes alocados por cover. Não inclui o registo de entidades nem a state
+machine do HA (iguais para qualquer integração), só o estado que a integração mantém.
+
+Requer o pacote `homeassistant` (ambiente de desenvolvimento):
+
+    python3 tools/footprint.py
+    python3 tools/footprint.py --covers 1000 10000 --budget 8192
+
+Termina com código 1 se alguma medição passar o orçamento (bytes por cover).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.cover_time_based_sync import cover as ctbs_cover  # noqa: E402
+
+BUDGET_BYTES_PER_COVER = 8 * 1024  # medido ~6–6,7 KiB: margem curta para apanhar regressões
+DEFAULT_COUNTS = (1000, 10000)
+
+
+class FootprintEntry:
+    """ConfigEntry mínima (só dados)."""
+
+    def __init__(self, entry_id: str, data: dict[str, Any]) -> None:
+        self.entry_id = entry_id
+        self.data = data
+        self.options: dict[str, Any] = {}
+
+
+def _cover_data(idx: int) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "name": f"footprint {idx}",
+        "travelling_time_up": 0.02,
+        "travelling_time_down": 0.02,
+        "close_contact_sensor_entity_id": "binary_sensor.fp_closed",
+    }
+    if idx % 2:
+        data["single_control_enabled"] = True
+        data["single_control_rf_script_entity_id"] = "script.fp_rf"
+    else:
+        data.update(
+            open_script_entity_id="script.fp_open",
+            close_script_entity_id="script.fp_close",
+            stop_script_entity_id="script.fp_stop",
+        )
+    return data
+
+
+async def _measure(hass: HomeAssistant, count: int) -> tuple[int, list[ctbs_cover.TimeBasedSyncCover]]:
+    """Bytes alocados (e mantidos) por 'count' covers adicionadas e com um movimento concluído."""
+    gc.collect()
+    before, _peak = tracemalloc.get_traced_memory()
+    covers: list[ctbs_cover.TimeBasedSyncCover] = []
+    for idx in range(count):
+        ent = ctbs_cover.TimeBasedSyncCover(hass, FootprintEntry(f"fp_{count}_{idx}", _cover_data(idx)))
+        ent.entity_id = f"cover.fp_{count}_{idx}"
+        await ent.async_added_to_hass()
+        covers.append(ent)
+    await asyncio.gather(*(ent.async_set_cover_position(position=50) for ent in covers))
+    while any(ent.is_opening or ent.is_closing for ent in covers):
+        await asyncio.sleep(0.05)
+    gc.collect()
+    after, _peak = tracemalloc.get_traced_memory()
+    return after - before, covers
+
+
+async def run(args: argparse.Namespace) -> tuple[list[tuple[int, int]], list[str]]:
+    # Sem state machine / restore: só interessa o estado mantido pela integração
+    ctbs_cover.TimeBasedSyncCover.async_write_ha_state = lambda self: None  # type: ignore[method-assign]
+
+    async def _no_last_state(self):
+        return None
+
+    ctbs_cover.TimeBasedSyncCover.async_get_last_state = _no_last_state  # type: ignore[method-assign]
+
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="ctbs_footprint_"))
+
+    async def _script_turn_on(call) -> None:
+        return None
+
+    hass.services.async_register("script", "turn_on", _script_turn_on)
+    hass.states.async_set("binary_sensor.fp_closed", "on")
+
+    results: list[tuple[int, int]] = []
+    failures: list[str] = []
+    tracemalloc.start()
+    for count in args.covers:
+        used, covers = await _measure(hass, count)
+        per_cover = used // max(1, count)
+        results.append((count, per_cover))
+        if per_cover > args.budget:
+            failures.append(f"{count} covers: {per_cover} bytes por cover (> {args.budget})")
+        for ent in covers:
+            await ent.async_will_remove_from_hass()
+        del covers
+    tracemalloc.stop()
+    return results, failures
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Memória por cover de Cover Time Based Sync.")
+    parser.add_argument("--covers", type=int, nargs="+", default=list(DEFAULT_COUNTS))
+    parser.add_argument("--budget", type=int, default=BUDGET_BYTES_PER_COVER, help="bytes por cover")
+    args = parser.parse_args(argv)
+
+    results, failures = asyncio.run(run(args))
+    for count, per_cover in results:
+        print(f"{count:>6} covers: {per_cover} bytes/cover ({per_cover / 1024:.1f} KiB)")
+    if failures:
+        print("FALHOU:")
+        for msg in failures:
+            print(f"  - {msg}")
+        return 1
+    print(f"Dentro do orçamento ({args.budget} bytes/cover)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Soak de reload para Cover Time Based Sync: N ciclos setup → movimento → unload.
+
+Em cada ciclo cria a entry/entidade pela plataforma (cover.async_setup_entry), arranca um
+movimento (runner vivo), e faz o unload como o Home Assistant (remoção da entidade,
+callbacks de unload, libertação da entry). Mede tasks asyncio vivas, tasks supervisionadas,
+entradas em hass.data e memória (tracemalloc) ao longo dos ciclos.
+
+Requer o pacote `homeassistant` (ambiente de desenvolvimento):
+
+    python3 tools/reload_soak.py --cycles 1000
+
+Termina com código 1 se as tasks ou a memória não ficarem estáveis.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.cover_time_based_sync import _async_release_entry  # noqa: E402
+from custom_components.cover_time_based_sync import async_setup as ctbs_async_setup  # noqa: E402
+from custom_components.cover_time_based_sync import cover as ctbs_cover  # noqa: E402
+from custom_components.cover_time_based_sync.const import DOMAIN  # noqa: E402
+
+WARMUP_CYCLES = 50
+MEMORY_BUDGET_BYTES = 256 * 1024  # crescimento tolerado entre o fim do warm-up e o fim
+
+
+class SoakEntry:
+    """ConfigEntry mínima: dados + callbacks de unload/update como o HA os gere."""
+
+    def __init__(self, entry_id: str, data: dict[str, Any]) -> None:
+        self.entry_id = entry_id
+        self.data = data
+        self.options: dict[str, Any] = {}
+        self._on_unload: list[Callable[[], None]] = []
+
+    def async_on_unload(self, func: Callable[[], None]) -> None:
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener: Callable[..., Any]) -> Callable[[], None]:
+        return lambda: None
+
+    def run_unload_callbacks(self) -> None:
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+def _snapshot(hass: HomeAssistant) -> dict[str, int]:
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    return {
+        "asyncio_tasks": len(asyncio.all_tasks()),
+        "entries": len(hass.data.get(DOMAIN, {})),
+        "dispatcher_targets": sum(len(v) for v in hass.data.get("dispatcher", {}).values()) if isinstance(hass.data.get("dispatcher"), dict) else 0,
+        "memory_bytes": current,
+    }
+
+
+async def run(args: argparse.Namespace) -> tuple[list[tuple[int, dict[str, int]]], list[str]]:
+    # Sem state machine / restore: só interessa o ciclo de vida das tasks e subscrições
+    ctbs_cover.TimeBasedSyncCover.async_write_ha_state = lambda self: None  # type: ignore[method-assign]
+
+    async def _no_last_state(self):
+        return None
+
+    ctbs_cover.TimeBasedSyncCover.async_get_last_state = _no_last_state  # type: ignore[method-assign]
+
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="ctbs_soak_"))
+    await ctbs_async_setup(hass, {})
+
+    async def _script_turn_on(call) -> None:
+        return None
+
+    hass.services.async_register("script", "turn_on", _script_turn_on)
+    hass.states.async_set("binary_sensor.soak_closed", "on")
+    hass.states.async_set("binary_sensor.soak_open", "on")
+
+    tracemalloc.start()
+    samples: list[tuple[int, dict[str, int]]] = []
+    supervisors_alive: list[str] = []
+    baseline: Optional[dict[str, int]] = None
+
+    for cycle in range(1, args.cycles + 1):
+        entry = SoakEntry(f"soak_{cycle}", {
+            "name": "soak",
+            "travelling_time_up": 30,
+            "travelling_time_down": 30,
+            "open_script_entity_id": "script.soak_open",
+            "close_script_entity_id": "script.soak_close",
+            "stop_script_entity_id": "script.soak_stop",
+            "close_contact_sensor_entity_id": "binary_sensor.soak_closed",
+            "open_contact_sensor_entity_id": "binary_sensor.soak_open",
+        })
+        added: list[ctbs_cover.TimeBasedSyncCover] = []
+        await ctbs_cover.async_setup_entry(hass, entry, lambda ents, update_before_add=False: added.extend(ents))
+        for ent in added:
+            ent.hass = hass
+            ent.entity_id = "cover.soak"
+            await ent.async_added_to_hass()
+            await ent.async_open_cover()  # runner vivo durante o unload
+        supervisor = hass.data[DOMAIN][entry.entry_id]["supervisor"]
+        await asyncio.sleep(0)
+
+        for ent in added:
+            await ent.async_will_remove_from_hass()
+        entry.run_unload_callbacks()
+        await _async_release_entry(hass, entry.entry_id)
+        if supervisor.live:
+            supervisors_alive.append(f"ciclo {cycle}: {supervisor.live} tasks supervisionadas vivas após unload")
+        del added, supervisor, entry
+
+        if cycle == WARMUP_CYCLES:
+            baseline = _snapshot(hass)
+        if cycle % args.sample_every == 0 or cycle == args.cycles:
+            samples.append((cycle, _snapshot(hass)))
+
+    final = _snapshot(hass)
+    tracemalloc.stop()
+    failures = supervisors_alive[:10]
+    if baseline is not None:
+        if final["asyncio_tasks"] > baseline["asyncio_tasks"]:
+            failures.append(f"tasks asyncio cresceram: {baseline['asyncio_tasks']} → {final['asyncio_tasks']}")
+        if final["entries"]:
+            failures.append(f"hass.data[{DOMAIN}] ainda com {final['entries']} entradas")
+        growth = final["memory_bytes"] - baseline["memory_bytes"]
+        if growth > MEMORY_BUDGET_BYTES:
+            failures.append(f"memória cresceu {growth} bytes (> {MEMORY_BUDGET_BYTES})")
+    return samples, failures
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Soak de reload (tasks e memória) de Cover Time Based Sync.")
+    parser.add_argument("--cycles", type=int, default=1000)
+    parser.add_argument("--sample-every", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    samples, failures = asyncio.run(run(args))
+    for cycle, snap in samples:
+        print(
+            f"ciclo {cycle:>6}: tasks={snap['asyncio_tasks']} entries={snap['entries']} "
+            f"dispatcher={snap['dispatcher_targets']} mem={snap['memory_bytes'] / 1024:.1f} KiB"
+        )
+    if failures:
+        print("FALHOU:")
+        for msg in failures:
+            print(f"  - {msg}")
+        return 1
+    print("Tasks e memória estáveis")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""
+Harness de stress para o lock por cover (_op_lock) de Cover Time Based Sync.
+
+Dispara misturas aleatórias e concorrentes de comandos contra várias TimeBasedSyncCover —
+chamadas diretas (open/close/stop/set_position), serviços do domínio (via dispatcher) e
+flips dos sensores de contacto — num event loop com relógio virtual (sem esperas reais).
+
+Por comando regista:
+  - espera na fila do _op_lock (s);
+  - tempo até à primeira atuação (script.turn_on) (s) — cada chamada a script.turn_on demora
+    --script-latency-ms (±50 %, como a ida ao bus/gateway), por isso os pulsos RF e as esperas
+    atrás de comandos em curso aparecem nos percentis;
+e no fim verifica invariantes e o estado final esperado de cada cover.
+
+Requer o pacote `homeassistant` (ambiente de desenvolvimento); não precisa de uma instância a correr:
+
+    python3 tools/stress_harness.py --covers 20 --commands 2000 --seed 1
+    python3 tools/stress_harness.py --rf-ratio 0.5 --json
+
+Termina com código 1 se alguma invariante falhar (útil em CI).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import types
+from typing import Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.core import HomeAssistant, ServiceCall  # noqa: E402
+
+from custom_components.cover_time_based_sync import async_setup as ctbs_async_setup  # noqa: E402
+from custom_components.cover_time_based_sync import coalesce as ctbs_coalesce  # noqa: E402
+from custom_components.cover_time_based_sync import cover as ctbs_cover  # noqa: E402
+from custom_components.cover_time_based_sync import pacing as ctbs_pacing  # noqa: E402
+from custom_components.cover_time_based_sync.const import DOMAIN  # noqa: E402
+from custom_components.cover_time_based_sync.travelcalculator import TravelCalculator  # noqa: E402
+
+TRAVEL_TIME = 20.0
+SETTLE_SEC = 3 * TRAVEL_TIME
+STUCK_SEC = 10 * TRAVEL_TIME  # comando por terminar após isto = bloqueado (ex.: deadlock no lock)
+SCRIPT_LATENCY_MS = 80.0
+
+
+# ------------------------------
+# Relógio virtual
+# ------------------------------
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop cujo relógio avança instantaneamente até ao próximo timer."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._virtual_now = 0.0
+        real_select = self._selector.select
+
+        def _select(timeout: Optional[float] = None):
+            ready = real_select(0)
+            if not ready and timeout:
+                self._virtual_now += timeout
+            return ready
+
+        self._selector.select = _select  # type: ignore[method-assign]
+
+    def time(self) -> float:
+        return self._virtual_now
+
+
+# ------------------------------
+# Registo por comando
+# ------------------------------
+@dataclass
+class CommandRecord:
+    kind: str
+    entity_id: str
+    issued_at: float
+    expected: Optional[int] = None  # posição final esperada se for o último efeito
+    lock_wait: Optional[float] = None
+    effect_seq: Optional[int] = None  # ordem da aquisição do lock em que o comando passou a valer
+    first_actuation: Optional[float] = None
+
+
+_CURRENT: contextvars.ContextVar[Optional[CommandRecord]] = contextvars.ContextVar("ctbs_cmd", default=None)
+_ACQUISITIONS = itertools.count()  # ordem global (no mesmo instante virtual há várias aquisições)
+
+
+class TimedLock(asyncio.Lock):
+    """asyncio.Lock que mede a espera de cada aquisição e a atribui ao comando corrente.
+
+    Um flip de contacto são dois handlers (toque e libertação), cada um com a sua aquisição:
+    o flip vale a partir da última (a libertação pode mover a cover depois de um comando simultâneo).
+    """
+
+    async def acquire(self) -> bool:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await super().acquire()
+        rec = _CURRENT.get()
+        if rec is not None and rec.lock_wait is None:
+            rec.lock_wait = loop.time() - started
+            rec.effect_seq = next(_ACQUISITIONS)
+        elif rec is not None and rec.kind.startswith("contact"):
+            rec.effect_seq = next(_ACQUISITIONS)
+        return result
+
+
+class HarnessCover(ctbs_cover.TimeBasedSyncCover):
+    """Cover sem state machine nem restore (conta apenas as escritas de estado)."""
+
+    writes = 0
+
+    def async_write_ha_state(self) -> None:
+        self.writes += 1
+
+    async def async_get_last_state(self):
+        return None
+
+
+@dataclass
+class Entry:
+    data: dict[str, Any]
+    entry_id: str
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+# ------------------------------
+# Geração de comandos
+# ------------------------------
+COMMAND_KINDS = (
+    "open", "close", "stop", "set_position",
+    "svc_action", "svc_position", "svc_activate",
+    "contact_close", "contact_open",
+)
+
+
+async def _issue(hass: HomeAssistant, cov: HarnessCover, kind: str, rec: CommandRecord) -> None:
+    """Executa o comando; a parte aleatória (alvo, ação) já vem sorteada em rec.expected."""
+    _CURRENT.set(rec)
+    eid = cov.entity_id
+    if kind == "open":
+        await cov.async_open_cover()
+    elif kind == "close":
+        await cov.async_close_cover()
+    elif kind == "stop":
+        await cov.async_stop_cover()
+    elif kind == "set_position":
+        await cov.async_set_cover_position(position=rec.expected)
+    elif kind == "svc_action":
+        action = "open" if rec.expected == 100 else "close" if rec.expected == 0 else "stop"
+        await hass.services.async_call(DOMAIN, "set_known_action", {"entity_id": eid, "action": action}, blocking=True)
+    elif kind == "svc_position":
+        await hass.services.async_call(
+            DOMAIN, "set_known_position",
+            {"entity_id": eid, "position": rec.expected, "position_type": "target"},
+            blocking=True,
+        )
+    elif kind == "svc_activate":
+        await hass.services.async_call(DOMAIN, "activate_script", {"entity_id": eid, "action": "stop"}, blocking=True)
+    elif kind in ("contact_close", "contact_open"):
+        sensor = cov._close_contact_sensor_id if kind == "contact_close" else cov._open_contact_sensor_id
+        hass.states.async_set(sensor, "off")
+        await asyncio.sleep(0)
+        hass.states.async_set(sensor, "on")
+
+
+def _expected_for(kind: str, rng: random.Random) -> Optional[int]:
+    if kind in ("open",):
+        return 100
+    if kind in ("close",):
+        return 0
+    if kind in ("set_position", "svc_position"):
+        return rng.randint(0, 100)
+    if kind == "svc_action":
+        return rng.choice((0, 100, None))
+    # stop / activate(stop) / flips de contacto: posição final não determinística
+    return None
+
+
+# ------------------------------
+# Estatísticas e invariantes
+# ------------------------------
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"n": 0}
+    vals = sorted(values)
+
+    def pct(p: float) -> float:
+        idx = min(len(vals) - 1, max(0, int(round(p / 100.0 * (len(vals) - 1)))))
+        return round(vals[idx] * 1000.0, 3)
+
+    return {"n": len(vals), "p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99), "max_ms": round(vals[-1] * 1000.0, 3)}
+
+
+def _check(covers: list[HarnessCover], records: list[CommandRecord]) -> list[str]:
+    violations: list[str] = []
+    last_effect: dict[str, CommandRecord] = {}
+    for rec in records:
+        if rec.effect_seq is None:
+            continue
+        prev = last_effect.get(rec.entity_id)
+        if prev is None or rec.effect_seq > prev.effect_seq:
+            last_effect[rec.entity_id] = rec
+
+    for cov in covers:
+        eid = cov.entity_id
+        pos = cov._position
+        if not 0 <= pos <= 100:
+            violations.append(f"{eid}: posição fora de 0..100 ({pos})")
+        if cov._op_lock.locked():
+            violations.append(f"{eid}: _op_lock ainda adquirido")
+        if cov._moving_direction is not None:
+            violations.append(f"{eid}: ainda em movimento ({cov._moving_direction}) após estabilizar")
+        if cov._calc is not None and abs(cov._calc.current_position() - pos) > 1.0:
+            violations.append(f"{eid}: calculador ({cov._calc.current_position():.1f}) ≠ entidade ({pos})")
+        last = last_effect.get(eid)
+        if last is not None and last.expected is not None and pos != last.expected:
+            violations.append(f"{eid}: esperado {last.expected} após '{last.kind}', obtido {pos}")
+    return violations
+
+
+# ------------------------------
+# Execução
+# ------------------------------
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    rng = random.Random(args.seed)
+
+    # Todo o tempo da integração passa a ser o relógio virtual do loop
+    virtual_time = types.SimpleNamespace(monotonic=loop.time)
+    ctbs_cover.time = virtual_time  # type: ignore[attr-defined]
+    ctbs_coalesce.time = virtual_time  # type: ignore[attr-defined]
+    ctbs_pacing.time = virtual_time  # type: ignore[attr-defined]
+    TravelCalculator.current_time = staticmethod(loop.time)  # type: ignore[method-assign]
+
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="ctbs_stress_"))
+    await ctbs_async_setup(hass, {})
+
+    actuations: list[tuple[float, str]] = []
+    latency_rng = random.Random(f"{args.seed}-latency")  # não altera a sequência de comandos
+
+    async def _script_turn_on(call: ServiceCall) -> None:
+        await asyncio.sleep(args.script_latency_ms / 1000.0 * latency_rng.uniform(0.5, 1.5))
+        actuations.append((loop.time(), call.data.get("entity_id")))
+        rec = _CURRENT.get()
+        if rec is not None and rec.first_actuation is None:
+            rec.first_actuation = loop.time() - rec.issued_at
+
+    hass.services.async_register("script", "turn_on", _script_turn_on)
+
+    covers: list[HarnessCover] = []
+    for i in range(args.covers):
+        rf = rng.random() < args.rf_ratio
+        data = {
+            "name": f"stress {i}",
+            "travelling_time_up": TRAVEL_TIME,
+            "travelling_time_down": TRAVEL_TIME,
+            "open_script_entity_id": f"script.stress_{i}_open",
+            "close_script_entity_id": f"script.stress_{i}_close",
+            "stop_script_entity_id": f"script.stress_{i}_stop",
+            "close_contact_sensor_entity_id": f"binary_sensor.stress_{i}_closed",
+            "open_contact_sensor_entity_id": f"binary_sensor.stress_{i}_open",
+            "single_control_enabled": rf,
+            "single_control_pulse_delay_ms": 400,
+        }
+        hass.states.async_set(data["close_contact_sensor_entity_id"], "on")
+        hass.states.async_set(data["open_contact_sensor_entity_id"], "on")
+        cov = HarnessCover(hass, Entry(data, f"stress_{i}"))
+        cov.hass = hass
+        cov.entity_id = f"cover.stress_{i}"
+        cov._op_lock = TimedLock()
+        await cov.async_added_to_hass()
+        covers.append(cov)
+
+    records: list[CommandRecord] = []
+    tasks: list[asyncio.Task] = []
+    kinds = [k for k in COMMAND_KINDS if args.contacts or not k.startswith("contact")]
+    for _ in range(args.commands):
+        # Rajadas: vários comandos no mesmo instante, em várias covers
+        if rng.random() > args.burst:
+            await asyncio.sleep(rng.expovariate(1.0 / args.mean_gap))
+        targets = rng.sample(covers, k=min(len(covers), rng.randint(1, args.fanout)))
+        kind = rng.choice(kinds)
+        for cov in targets:
+            rec = CommandRecord(kind, cov.entity_id, loop.time(), _expected_for(kind, rng))
+            records.append(rec)
+            ctx = contextvars.copy_context()
+            tasks.append(loop.create_task(_issue(hass, cov, kind, rec), context=ctx))
+
+    _done, pending = await asyncio.wait(tasks, timeout=STUCK_SEC) if tasks else (set(), set())
+    stuck = [rec for rec, task in zip(records, tasks) if task in pending]
+    for task in pending:
+        task.cancel()
+    errors = [t.exception() for t in _done if not t.cancelled() and t.exception() is not None]
+    await asyncio.sleep(SETTLE_SEC)
+    for cov in covers:
+        if cov._moving_task is not None:
+            await asyncio.gather(cov._moving_task, return_exceptions=True)
+
+    by_kind: dict[str, dict[str, Any]] = {}
+    for kind in sorted({r.kind for r in records}):
+        recs = [r for r in records if r.kind == kind]
+        by_kind[kind] = {
+            "lock_wait": _percentiles([r.lock_wait for r in recs if r.lock_wait is not None]),
+            "first_actuation": _percentiles([r.first_actuation for r in recs if r.first_actuation is not None]),
+        }
+    violations = _check(covers, records)
+    violations += [f"{r.entity_id}: '{r.kind}' bloqueado (> {STUCK_SEC:.0f} s)" for r in stuck]
+    violations += [f"exceção: {exc!r}" for exc in errors]
+    return {
+        "covers": len(covers),
+        "commands": len(records),
+        "actuations": len(actuations),
+        "state_writes": sum(c.writes for c in covers),
+        "virtual_seconds": round(loop.time(), 1),
+        "lock_wait": _percentiles([r.lock_wait for r in records if r.lock_wait is not None]),
+        "first_actuation": _percentiles([r.first_actuation for r in records if r.first_actuation is not None]),
+        "by_kind": by_kind,
+        "violations": violations,
+    }
+
+
+def _print_report(rep: dict[str, Any]) -> None:
+    print(
+        f"{rep['commands']} comandos em {rep['covers']} covers — {rep['actuations']} atuações, "
+        f"{rep['state_writes']} escritas de estado, {rep['virtual_seconds']} s virtuais"
+    )
+
+    def line(label: str, st: dict[str, Any]) -> str:
+        if not st.get("n"):
+            return f"  {label:<28} —"
+        return f"  {label:<28} p50={st['p50_ms']}ms p95={st['p95_ms']}ms p99={st['p99_ms']}ms max={st['max_ms']}ms (n={st['n']})"
+
+    print(line("espera _op_lock", rep["lock_wait"]))
+    print(line("1ª atuação", rep["first_actuation"]))
+    for kind, st in rep["by_kind"].items():
+        print(line(f"{kind} / lock", st["lock_wait"]))
+        print(line(f"{kind} / 1ª atuação", st["first_actuation"]))
+    if rep["violations"]:
+        print(f"{len(rep['violations'])} invariantes falhadas:")
+        for v in rep["violations"]:
+            print(f"  - {v}")
+    else:
+        print("Invariantes OK")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stress do _op_lock de Cover Time Based Sync (relógio virtual).")
+    parser.add_argument("--covers", type=int, default=10)
+    parser.add_argument("--commands", type=int, default=500)
+    parser.add_argument("--fanout", type=int, default=5, help="Máx. de covers por comando (fan-out do dispatcher)")
+    parser.add_argument("--burst", type=float, default=0.6, help="Probabilidade de o comando sair no mesmo instante")
+    parser.add_argument("--mean-gap", type=float, default=2.0, help="Intervalo médio entre rajadas (s virtuais)")
+    parser.add_argument("--rf-ratio", type=float, default=0.3, help="Fração de covers em modo Controlo Único")
+    parser.add_argument(
+        "--script-latency-ms", type=float, default=SCRIPT_LATENCY_MS, help="Latência média de script.turn_on (ms virtuais)"
+    )
+    parser.add_argument("--no-contacts", dest="contacts", action="store_false", help="Sem flips de contacto")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    loop = VirtualClockLoop()
+    try:
+        asyncio.set_event_loop(loop)
+        report = loop.run_until_complete(run(args))
+    finally:
+        loop.close()
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        _print_report(report)
+    return 1 if report["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())